@@ -1,57 +1,241 @@
 import re
 import json
+import logging
 import os
+import threading
+import httpx
+import orjson
+from collections import OrderedDict
+from functools import lru_cache
 from typing import List
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from models import SearchParams, AIRBNB_PROPERTY_TYPES
-from groq import Groq
+from groq import AsyncGroq, Groq
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Groq client for parameter extraction
+logger = logging.getLogger(__name__)
+
+# Month names accepted in dates, mapped to month numbers
+_MONTH_NUMBERS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+# Longest names first so "june" is matched directly instead of after backtracking from "jun"
+_MONTH_ALTERNATION = '|'.join(sorted(_MONTH_NUMBERS, key=len, reverse=True))
+
+# Date patterns to match various formats, tagged with how their groups are read.
+# They are matched against lowercased text, so they are written in lowercase without re.IGNORECASE
+_DATE_PATTERNS = [(re.compile(pattern), kind) for pattern, kind in (
+    # Month/Day - Month/Day (e.g., "6/15 - 6/20", "6/15-6/20")
+    (r"(\d{1,2})/(\d{1,2})\s*-\s*(\d{1,2})/(\d{1,2})", "range"),
+    # Month Day - Month Day (e.g., "June 15 - June 20", "Jun 15-20")
+    (rf"({_MONTH_ALTERNATION})\s+(\d{{1,2}})\s*-\s*(?:({_MONTH_ALTERNATION})\s+)?(\d{{1,2}})", "range"),
+    # Day Month - Day Month (e.g., "15 June - 20 June")
+    (rf"(\d{{1,2}})\s+({_MONTH_ALTERNATION})\s*-\s*(\d{{1,2}})\s+({_MONTH_ALTERNATION})", "range"),
+    # MM-DD format (e.g., "06-15 to 06-20")
+    (r"(\d{1,2})-(\d{1,2})\s*(?:to|through|-)\s*(\d{1,2})-(\d{1,2})", "range"),
+    # Single dates mentioned separately
+    (r"(?:check.?in|arrive|arrival|start).*?(\d{1,2})/(\d{1,2})|(\d{1,2})/(\d{1,2}).*?(?:check.?in|arrive|arrival|start)", "checkin"),
+    (r"(?:check.?out|leave|departure|end).*?(\d{1,2})/(\d{1,2})|(\d{1,2})/(\d{1,2}).*?(?:check.?out|leave|departure|end)", "checkout"),
+)]
+
+# Every date pattern needs at least one digit, so text without one can't contain a date
+_DIGIT_RE = re.compile(r"\d")
+
+# Known cities/locations. The known-location, guest, budget, property and amenity
+# patterns are matched against pre-lowered text, so they are all lowercase and skip
+# re.IGNORECASE; only the location patterns need the original casing.
+_KNOWN_LOCATIONS = [
+    'almaty', 'astana', 'shymkent', 'aktobe', 'taraz', 'pavlodar',
+    'tokyo', 'new york', 'london', 'paris', 'berlin', 'madrid', 'rome',
+    'moscow', 'beijing', 'seoul', 'bangkok', 'dubai', 'istanbul', 'kazakhstan',
+    # Russian/Cyrillic names
+    'стамбул', 'москва', 'алматы', 'астана', 'токио', 'лондон', 'париж',
+]
+# Cyrillic names resolve to the English city name used in Airbnb search URLs
+_KNOWN_LOCATION_NAMES = {known: known.title() for known in _KNOWN_LOCATIONS}
+_KNOWN_LOCATION_NAMES.update({
+    'стамбул': 'Istanbul', 'москва': 'Moscow', 'алматы': 'Almaty', 'астана': 'Astana',
+    'токио': 'Tokyo', 'лондон': 'London', 'париж': 'Paris',
+})
+# Single alternation so the text is scanned once rather than once per city
+_KNOWN_LOCATION_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _KNOWN_LOCATIONS)) + r')\b')
+
+# Words that show a location pattern captured something other than a place
+_NON_LOCATIONS = frozenset({
+    'help', 'looking', 'need', 'want', 'find', 'search', 'book', 'stay',
+    'apartment', 'house', 'place', 'room', 'home', 'hotel', 'rental',
+    'cheap', 'expensive', 'budget', 'luxury', 'nice', 'good', 'great', 'perfect',
+    'people', 'guests', 'adults', 'person', 'me', 'us', 'them',
+    'night', 'day', 'week', 'month', 'year', 'time', 'date',
+    'price', 'cost', 'money', 'dollar', 'accommodation',
+    'something', 'somewhere', 'anywhere', 'anything', 'everything',
+    'you', 'the', 'airbnb',
+    'mountains', 'beach', 'downtown', 'center', 'close', 'closer', 'near',  # Geographic descriptors, not cities
+})
+_BAD_LOCATION_PHRASES = ('help you', 'find the', 'perfect airbnb')
+
+_LOCATION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Specific travel prepositions with city names
+    r"(?:in|to|at|visit|stay in|going to|traveling to|fly to|book in|rent.*in)\s+([A-Z][a-zA-Z]{2,}(?:\s+[A-Z][a-zA-Z]+)*?)(?:\s+in\s+\d|\s+for\s+\d|\s+with\s+\d|\s*[,.]|\s*$)",
+    # Looking for places/areas
+    r"(?:place|area|city|town)\s+(?:like|in|near)\s+([A-Z][a-zA-Z]{2,}(?:\s+[A-Z][a-zA-Z]+)*)",
+)]
+
+# Guest count patterns
+_GUEST_PATTERNS = [re.compile(pattern) for pattern in (
+    r"(\d+)\s+(?:people|guests?|person|adults?)",
+    r"(?:for|with)\s+(\d+)",
+    r"(\d+)\s+of us",
+)]
+
+# Rough exchange rate for budgets given in tenge
+_KZT_PER_USD = 450
+
+# Budget patterns, tagged with how the matched number(s) should be read
+_BUDGET_PATTERNS = [(re.compile(pattern), kind) for pattern, kind in (
+    (r"(\d+)\s*(?:usd|dollars?)\s*(?:max|maximum|per\s*day\s*max)", "max"),  # "70 USD max", "70 dollars max"
+    (r"(\d+)\s*(?:per\s*day|daily|nightly?)\s*(?:max|maximum)", "max"),  # "70 per day max"
+    (r"max(?:imum)?\s*(?:of\s*)?(?:usd\s*)?(?:\$)?(\d+)", "max"),  # "maximum $70", "max of 70"
+    (r"under\s*(?:\$)?(\d+)", "max"),  # "under $70"
+    (r"below\s*(?:\$)?(\d+)", "max"),  # "below 70"
+    (r"up\s*to\s*(?:\$)?(\d+)", "max"),  # "up to 70"
+    (r"(\d+)\s*(?:kzt|tenge)", "kzt"),  # KZT currency
+    (r"\$(\d+)(?:\s*-\s*\$?(\d+))?", "range"),  # $70-100 or $70
+    (r"(\d+)\s*(?:to|through|-)\s*(\d+)\s*(?:dollars?|\$)", "range"),  # 70 to 100 dollars
+    (r"budget\s+(?:of\s+)?(?:around\s+)?\$?(\d+)", "around"),  # budget of $70
+)]
+
+# Property words and the type they stand for. Types are checked in this order,
+# so "a house or an apartment" is a house wherever each word appears
+_PROPERTY_MAPPING = {
+    'house': 'house', 'houses': 'house', 'home': 'house', 'homes': 'house',
+    'apartment': 'apartment', 'apartments': 'apartment', 'apt': 'apartment', 'apts': 'apartment',
+    'villa': 'villa', 'villas': 'villa',
+    'cabin': 'cabin', 'cabins': 'cabin',
+    'loft': 'loft', 'lofts': 'loft',
+    'cottage': 'cottage', 'cottages': 'cottage'
+}
+_PROPERTY_TYPE_ORDER = tuple(dict.fromkeys(_PROPERTY_MAPPING.values()))
+
+# All property words in one alternation, so only those words are ever materialized
+_PROPERTY_RE = re.compile(r'\b(' + '|'.join(sorted(_PROPERTY_MAPPING, key=len, reverse=True)) + r')\b')
+
+# Amenity keywords, combined into one pattern with a named group per amenity
+_AMENITY_KEYWORDS = (
+    ('wifi', r'wifi|wi-fi|internet|wireless'),
+    ('kitchen', r'kitchen|cook|cooking|kitchenette'),
+    ('pool', r'pool|swimming|swim'),
+    ('parking', r'parking|garage|park'),
+    ('air_conditioning', r'air\s*conditioning|ac|a/c|cool|cooling'),
+    ('washer', r'washer|washing|laundry'),
+    ('hot_tub', r'hot\s*tub|jacuzzi|spa'),
+    ('gym', r'gym|fitness|workout'),
+    ('pets_allowed', r'pet|pets|dog|cat|pet-friendly'),
+)
+_AMENITY_NAMES = tuple(amenity for amenity, _ in _AMENITY_KEYWORDS)
+_AMENITY_RE = re.compile(
+    '|'.join(rf'(?P<{amenity}>\b(?:{keywords})\b)' for amenity, keywords in _AMENITY_KEYWORDS)
+)
+
+# Travel words that make an unresolved conversation worth an LLM call.
+# Plain substrings (no word boundaries), found in a single scan
+_LLM_HINT_RE = re.compile(r'accommodation|travel|trip|visit|booking|stay', re.IGNORECASE)
+
+# Connection pool shared by both Groq clients. Idle connections are kept for a minute rather than
+# httpx's default 5s, so a user's next chat turn still finds a warm TLS connection
+_GROQ_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
+# Extraction replies are a short JSON object, so a stalled call gives up early and falls back to regex.
+# Chat replies are generated (and streamed) in full, so they keep the Groq SDK's 60s default read timeout
+_GROQ_EXTRACTION_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+_GROQ_REPLY_TIMEOUT = httpx.Timeout(60.0, connect=2.0)
 
 def get_groq_client():
-    return Groq(api_key=os.getenv("GROQ_API_KEY"))
+    """Shared Groq client, created on first use (None when no API key is configured)"""
+    api_key = os.getenv("GROQ_API_KEY")
+    # A missing key isn't cached, so a key set later is picked up
+    return _groq_client_for(api_key) if api_key else None
+
+@lru_cache(maxsize=None)
+def _groq_client_for(api_key: str):
+    # Keep-alive HTTP/2 pool so concurrent extractions reuse one TLS connection
+    http_client = httpx.Client(
+        http2=True,
+        limits=_GROQ_POOL_LIMITS,
+        timeout=_GROQ_EXTRACTION_TIMEOUT,
+    )
+    return Groq(api_key=api_key, http_client=http_client)
+
+def get_async_groq_client():
+    """Shared AsyncGroq client for the chat reply, same pooling as get_groq_client() but a longer timeout"""
+    api_key = os.getenv("GROQ_API_KEY")
+    return _async_groq_client_for(api_key) if api_key else None
+
+@lru_cache(maxsize=None)
+def _async_groq_client_for(api_key: str):
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=_GROQ_POOL_LIMITS,
+        timeout=_GROQ_REPLY_TIMEOUT,
+    )
+    return AsyncGroq(api_key=api_key, http_client=http_client)
+
+# System prompt for LLM parameter extraction; the conversation is sent as the user message.
+# JSON mode guarantees an object back, so only the schema and the rules regex gets wrong are kept.
+_EXTRACTION_SYSTEM_PROMPT = """Extract travel accommodation search parameters from the user's conversation, which may be in any language. Reply with a JSON object:
+{"location": city name in English or null, "checkin": "YYYY-MM-DD" or null, "checkout": "YYYY-MM-DD" or null, "guests": number or null, "min_price": number or null, "max_price": number or null, "property_type": "apartment"/"house"/"villa"/"cabin"/"loft"/"cottage" or null}
+
+Rules:
+- Translate city names to English (стамбул → Istanbul, нью-йорк → New York); flat → apartment, home → house
+- Checkout must be after checkin
+- "max 70", "up to 70", "under 70" → only max_price: 70
+- "at least 100", "from 100" → only min_price: 100
+- "around 200" → min_price: 150, max_price: 250
+- "100-200", "between 100 and 200" → min_price: 100, max_price: 200
+- Never set min_price and max_price to the same value unless that range was given
+- Use null for anything not mentioned"""
+
+def _roll_past_stay_forward(checkin_dt: datetime, checkout_dt: datetime, today: datetime) -> tuple[datetime, datetime]:
+    """Move a stay whose check-in is already past to the next occurrence of that check-in day"""
+    if checkin_dt.date() >= today.date():
+        return checkin_dt, checkout_dt
+    year = today.year if (checkin_dt.month, checkin_dt.day) >= (today.month, today.day) else today.year + 1
+    years = year - checkin_dt.year
+    return checkin_dt.replace(year=year), checkout_dt.replace(year=checkout_dt.year + years)
 
 def extract_dates_from_text(text: str) -> tuple[str, str]:
     """Extract check-in and check-out dates from text"""
-    print(f"DEBUG - Extracting dates from: '{text}'")
+    if not _DIGIT_RE.search(text):
+        return None, None
     
-    # Date patterns to match various formats
-    date_patterns = [
-        # Month/Day - Month/Day (e.g., "6/15 - 6/20", "6/15-6/20")
-        r"(\d{1,2})/(\d{1,2})\s*-\s*(\d{1,2})/(\d{1,2})",
-        # Month Day - Month Day (e.g., "June 15 - June 20", "Jun 15-20")
-        r"(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{1,2})\s*-\s*(?:(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+)?(\d{1,2})",
-        # Day Month - Day Month (e.g., "15 June - 20 June")
-        r"(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s*-\s*(\d{1,2})\s+(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)",
-        # MM-DD format (e.g., "06-15 to 06-20")
-        r"(\d{1,2})-(\d{1,2})\s*(?:to|through|-)\s*(\d{1,2})-(\d{1,2})",
-        # Single dates mentioned separately
-        r"(?:check.?in|arrive|arrival|start).*?(\d{1,2})/(\d{1,2})|(\d{1,2})/(\d{1,2}).*?(?:check.?in|arrive|arrival|start)",
-        r"(?:check.?out|leave|departure|end).*?(\d{1,2})/(\d{1,2})|(\d{1,2})/(\d{1,2}).*?(?:check.?out|leave|departure|end)",
-    ]
+    logger.debug("Extracting dates from: '%s'", text)
+    text = text.lower()
     
-    current_year = datetime.now().year
+    # One clock read per call, shared by the year default and the past-date check below
+    today = datetime.now()
+    current_year = today.year
     checkin_date = None
     checkout_date = None
     
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+    for pattern, kind in _DATE_PATTERNS:
+        matches = pattern.finditer(text)
         for match in matches:
             try:
                 groups = match.groups()
-                print(f"DEBUG - Date pattern matched: {match.group(0)} -> groups: {groups}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Date pattern matched: %s -> groups: %s", match.group(0), groups)
                 
-                if "check.?in" in pattern or "arrive" in pattern:
+                if kind == "checkin":
                     # Handle check-in patterns
                     month = int(groups[0] or groups[2]) if groups[0] or groups[2] else None
                     day = int(groups[1] or groups[3]) if groups[1] or groups[3] else None
                     if month and day:
                         checkin_date = f"{current_year}-{month:02d}-{day:02d}"
-                elif "check.?out" in pattern or "leave" in pattern:
+                elif kind == "checkout":
                     # Handle check-out patterns
                     month = int(groups[0] or groups[2]) if groups[0] or groups[2] else None
                     day = int(groups[1] or groups[3]) if groups[1] or groups[3] else None
@@ -69,21 +253,12 @@ def extract_dates_from_text(text: str) -> tuple[str, str]:
                         
                     else:
                         # Month name format
-                        month_names = {
-                            'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-                            'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
-                            'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                        }
-                        
-                        checkin_month_name = groups[0].lower()
+                        checkin_month = _MONTH_NUMBERS.get(groups[0])
                         checkin_day = int(groups[1])
-                        checkout_month_name = (groups[2] or groups[0]).lower()  # Use same month if not specified
+                        checkout_month = _MONTH_NUMBERS.get(groups[2] or groups[0])  # Use same month if not specified
                         checkout_day = int(groups[3])
                         
-                        if checkin_month_name in month_names and checkout_month_name in month_names:
-                            checkin_month = month_names[checkin_month_name]
-                            checkout_month = month_names[checkout_month_name]
-                            
+                        if checkin_month and checkout_month:
                             checkin_date = f"{current_year}-{checkin_month:02d}-{checkin_day:02d}"
                             checkout_date = f"{current_year}-{checkout_month:02d}-{checkout_day:02d}"
                 
@@ -91,7 +266,7 @@ def extract_dates_from_text(text: str) -> tuple[str, str]:
                     break
                     
             except (ValueError, IndexError) as e:
-                print(f"DEBUG - Error parsing date match: {e}")
+                logger.debug("Error parsing date match: %s", e)
                 continue
     
     # Validate and fix dates
@@ -105,83 +280,82 @@ def extract_dates_from_text(text: str) -> tuple[str, str]:
                 checkout_dt = checkin_dt + timedelta(days=3)  # Default 3-day stay
                 checkout_date = checkout_dt.strftime("%Y-%m-%d")
             
-            # Ensure dates are not in the past
-            today = datetime.now()
-            if checkin_dt < today:
-                # Move dates to next occurrence
-                if checkin_dt.month < today.month or (checkin_dt.month == today.month and checkin_dt.day < today.day):
-                    checkin_dt = checkin_dt.replace(year=current_year + 1)
-                    checkout_dt = checkout_dt.replace(year=current_year + 1)
-                    checkin_date = checkin_dt.strftime("%Y-%m-%d")
-                    checkout_date = checkout_dt.strftime("%Y-%m-%d")
+            # Ensure dates are not in the past - move them to the next occurrence
+            checkin_dt, checkout_dt = _roll_past_stay_forward(checkin_dt, checkout_dt, today)
+            checkin_date = checkin_dt.strftime("%Y-%m-%d")
+            checkout_date = checkout_dt.strftime("%Y-%m-%d")
             
-            print(f"DEBUG - Extracted and validated dates: {checkin_date} to {checkout_date}")
+            logger.debug("Extracted and validated dates: %s to %s", checkin_date, checkout_date)
             return checkin_date, checkout_date
             
         except ValueError as e:
-            print(f"DEBUG - Date validation error: {e}")
+            logger.debug("Date validation error: %s", e)
     
-    print("DEBUG - No valid dates extracted")
+    logger.debug("No valid dates extracted")
     return None, None
 
+_JSON_DECODER = json.JSONDecoder()
+
+# Successful LLM extractions keyed by case/whitespace-normalized text, most recent last,
+# so rephrasings that differ only in casing or spacing skip the Groq round trip
+_LLM_CACHE_SIZE = 512
+_llm_cache = OrderedDict()
+_llm_cache_lock = threading.Lock()
+
+def _llm_cache_key(conversation_text: str, today: datetime) -> tuple:
+    # Dates are resolved against today, so a cached reply is only reused on the same day
+    return today.date(), ' '.join(conversation_text.lower().split())
+
+def _parse_llm_json(response_text: str) -> dict:
+    """Parse the LLM's JSON reply, tolerating text before or after the object"""
+    try:
+        return orjson.loads(response_text)
+    except orjson.JSONDecodeError:
+        # Decode the first object in place instead of rerunning the whole extraction
+        start = response_text.find('{')
+        if start == -1:
+            raise
+        return _JSON_DECODER.raw_decode(response_text, start)[0]
+
 def extract_search_params_with_llm(conversation_text: str) -> SearchParams:
     """Use LLM to extract search parameters from conversation in any language"""
+    today = datetime.now()
+    cache_key = _llm_cache_key(conversation_text, today)
+    with _llm_cache_lock:
+        cached = _llm_cache.get(cache_key)
+        if cached is not None:
+            _llm_cache.move_to_end(cache_key)
+    if cached is not None:
+        logger.debug("LLM extraction cache hit")
+        return cached.copy()
     
-    extraction_prompt = f"""
-Extract travel accommodation search parameters from this conversation. The user might be speaking in any language (English, Russian, Spanish, etc.).
-
-Conversation: "{conversation_text}"
-
-Please extract and respond with ONLY a JSON object in this exact format:
-{{
-    "location": "city name in English (e.g. Istanbul, New York, Moscow)",
-    "checkin": "YYYY-MM-DD or null",
-    "checkout": "YYYY-MM-DD or null", 
-    "guests": number or null,
-    "min_price": number or null, 
-    "max_price": number or null,
-    "property_type": "apartment/house/villa/cabin/loft/cottage" or null
-}}
-
-DATE EXTRACTION RULES:
-- "6/15 - 6/20" → checkin: "2024-06-15", checkout: "2024-06-20"
-- "June 15-20" → checkin: "2024-06-15", checkout: "2024-06-20"
-- "15 June to 20 June" → checkin: "2024-06-15", checkout: "2024-06-20"
-- Always use current year (2024) unless specified otherwise
-- Ensure checkout date is after checkin date
-
-CRITICAL PRICING RULES:
-- "70 USD max" or "maximum 70" or "up to 70" → set ONLY max_price: 70, min_price: null
-- "under 150" or "below 150" → set ONLY max_price: 150, min_price: null  
-- "around 200" or "about 200" or "roughly 200" → set min_price: 150, max_price: 250
-- "100-200" or "between 100 and 200" or "from 100 to 200" → set min_price: 100, max_price: 200
-- "at least 100" or "minimum 100" or "starting from 100" → set ONLY min_price: 100, max_price: null
-
-OTHER RULES:
-- Convert city names to English (стамбул → Istanbul, нью-йорк → New York)
-- Extract guest count from phrases like "4 adults", "нас 4", "2 people"
-- For property types: flat/apartment → "apartment", house/home → "house"
-- Return null for missing information
-
-DO NOT set both min_price and max_price to the same value unless explicitly given a range!
-"""
-
     try:
-        print(f"DEBUG - LLM extraction input: '{conversation_text[:200]}...'")
+        # Inside the try: a client that can't be built falls back to regex like any other Groq error
+        groq_client = get_groq_client()
+        if groq_client is None:
+            logger.debug("GROQ_API_KEY not set, using regex extraction")
+            return extract_search_params_regex(conversation_text)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLM extraction input: '%s...'", conversation_text[:200])
         
-        completion = get_groq_client().chat.completions.create(
+        completion = groq_client.chat.completions.create(
             model="llama-3.1-8b-instant",
-            messages=[{"role": "user", "content": extraction_prompt}],
+            messages=[
+                {"role": "system", "content": f"{_EXTRACTION_SYSTEM_PROMPT}\n- Today is {today:%Y-%m-%d}; a date without a year is its next occurrence from today"},
+                {"role": "user", "content": conversation_text},
+            ],
             temperature=0.1,  # Low temperature for consistent extraction
-            max_tokens=200
+            max_tokens=120,  # The JSON reply is well under 100 tokens
+            response_format={"type": "json_object"}  # JSON mode so the reply parses directly
         )
         
-        response_text = completion.choices[0].message.content.strip()
-        print(f"DEBUG - LLM extraction response: {response_text}")
+        response_text = completion.choices[0].message.content  # orjson skips surrounding whitespace itself
+        logger.debug("LLM extraction response: %s", response_text)
         
         # Parse the JSON response
         try:
-            extracted_data = json.loads(response_text)
+            extracted_data = _parse_llm_json(response_text)
             
             params = SearchParams()
             params.location = extracted_data.get('location')
@@ -192,18 +366,36 @@ DO NOT set both min_price and max_price to the same value unless explicitly give
             params.max_price = extracted_data.get('max_price')
             params.property_type = extracted_data.get('property_type')
             
-            print(f"DEBUG - LLM extracted successfully: location='{params.location}', dates={params.checkin} to {params.checkout}, guests={params.guests}, price=${params.min_price}-${params.max_price}")
+            # The model can still answer with a past year - apply the same roll-forward as the regex path
+            if params.checkin:
+                try:
+                    checkin_dt = datetime.strptime(params.checkin, "%Y-%m-%d")
+                    checkout_dt = datetime.strptime(params.checkout, "%Y-%m-%d") if params.checkout else checkin_dt
+                    checkin_dt, checkout_dt = _roll_past_stay_forward(checkin_dt, checkout_dt, today)
+                    params.checkin = checkin_dt.strftime("%Y-%m-%d")
+                    if params.checkout:
+                        params.checkout = checkout_dt.strftime("%Y-%m-%d")
+                except (TypeError, ValueError) as e:
+                    logger.debug("LLM date validation error: %s", e)
+            
+            logger.debug("LLM extracted successfully: location='%s', dates=%s to %s, guests=%s, price=$%s-$%s", params.location, params.checkin, params.checkout, params.guests, params.min_price, params.max_price)
+            
+            # Only successful extractions are cached; failures fall back to regex and retry next time
+            with _llm_cache_lock:
+                _llm_cache[cache_key] = params.copy()
+                if len(_llm_cache) > _LLM_CACHE_SIZE:
+                    _llm_cache.popitem(last=False)
             return params
             
         except json.JSONDecodeError as e:
-            print(f"DEBUG - JSON parsing error: {e}")
-            print(f"DEBUG - Raw LLM response: '{response_text}'")
+            logger.warning("JSON parsing error: %s", e)
+            logger.warning("Raw LLM response: '%s'", response_text)
             # Fallback to regex extraction
             return extract_search_params_regex(conversation_text)
             
     except Exception as e:
-        print(f"DEBUG - LLM extraction error: {e}")
-        print(f"DEBUG - Falling back to regex extraction")
+        logger.warning("LLM extraction error: %s", e)
+        logger.warning("Falling back to regex extraction")
         # Fallback to regex extraction
         return extract_search_params_regex(conversation_text)
 
@@ -211,7 +403,7 @@ def extract_search_params_regex(conversation_text: str) -> SearchParams:
     """Extract search parameters from conversation using regex patterns"""
     params = SearchParams()
     
-    print(f"DEBUG - Input text: '{conversation_text}'")
+    logger.debug("Input text: '%s'", conversation_text)
     
     # Extract dates first
     checkin_date, checkout_date = extract_dates_from_text(conversation_text)
@@ -220,208 +412,114 @@ def extract_search_params_regex(conversation_text: str) -> SearchParams:
     if checkout_date:
         params.checkout = checkout_date
     
-    # First try to find known cities/locations directly (more reliable)
-    known_locations = [
-        'almaty', 'astana', 'shymkent', 'aktobe', 'taraz', 'pavlodar',
-        'tokyo', 'new york', 'london', 'paris', 'berlin', 'madrid', 'rome',
-        'moscow', 'beijing', 'seoul', 'bangkok', 'dubai', 'istanbul', 'kazakhstan',
-        # Russian/Cyrillic names
-        'стамбул', 'москва', 'алматы', 'астана', 'токио', 'лондон', 'париж',
-        
-    ]
-    
+    # Lowercased once for every pattern that doesn't need the original casing
+    conversation_lower = conversation_text.lower()
     
+    # First try to find known cities/locations directly (more reliable, highest priority)
+    # Use word boundaries to match exact city names
+    known_match = _KNOWN_LOCATION_RE.search(conversation_lower)
+    if known_match:
+        params.location = _KNOWN_LOCATION_NAMES[known_match.group(1)]
+        logger.debug("Found known location: '%s'", params.location)
     
-    # Check for known locations first (highest priority)
-    for known in known_locations:
-        # Use word boundaries to match exact city names
-        pattern = r'\b' + re.escape(known.lower()) + r'\b'
-        if re.search(pattern, conversation_text.lower()):
-            params.location = known.title()
-            print(f"DEBUG - Found known location: '{params.location}'")
-            break
-    
-    # If no known location found, try pattern matching
+    # If no known location found, try pattern matching; stop at the first accepted candidate
     if not params.location:
-        # More specific location patterns
-        location_patterns = [
-            # Specific travel prepositions with city names
-            r"(?:in|to|at|visit|stay in|going to|traveling to|fly to|book in|rent.*in)\s+([A-Z][a-zA-Z]{2,}(?:\s+[A-Z][a-zA-Z]+)*?)(?:\s+in\s+\d|\s+for\s+\d|\s+with\s+\d|\s*[,.]|\s*$)",
-            # Looking for places/areas
-            r"(?:place|area|city|town)\s+(?:like|in|near)\s+([A-Z][a-zA-Z]{2,}(?:\s+[A-Z][a-zA-Z]+)*)",
-        ]
-        
-        for i, pattern in enumerate(location_patterns):
-            matches = re.finditer(pattern, conversation_text, re.IGNORECASE)
-            for match in matches:
-                if not params.location:
-                    location = match.group(1).strip()
-                    print(f"DEBUG - Pattern {i+1} found potential location: '{location}'")
-                    
-                    # Strict filtering of non-locations
-                    non_locations = {
-                        'help', 'looking', 'need', 'want', 'find', 'search', 'book', 'stay', 
-                        'apartment', 'house', 'place', 'room', 'home', 'hotel', 'rental',
-                        'cheap', 'expensive', 'budget', 'luxury', 'nice', 'good', 'great', 'perfect',
-                        'people', 'guests', 'adults', 'person', 'me', 'us', 'them',
-                        'night', 'day', 'week', 'month', 'year', 'time', 'date',
-                        'price', 'cost', 'money', 'dollar', 'budget', 'accommodation',
-                        'something', 'somewhere', 'anywhere', 'anything', 'everything',
-                        'you', 'find', 'the', 'perfect', 'airbnb', 'help you find',
-                        'mountains', 'beach', 'downtown', 'center', 'close', 'closer', 'near'  # Geographic descriptors, not cities
-                    }
-                    
-                    # Clean the location and check if it's valid
-                    location_clean = location.strip().lower()
-                    location_words = location_clean.split()
-                    
-                    # Check if any word in the location is a non-location
-                    is_valid_location = True
-                    for word in location_words:
-                        if word in non_locations:
-                            is_valid_location = False
-                            print(f"DEBUG - Rejected '{location}' because it contains non-location word: '{word}'")
-                            break
+        for i, pattern in enumerate(_LOCATION_PATTERNS):
+            for match in pattern.finditer(conversation_text):
+                location = match.group(1).strip()
+                logger.debug("Pattern %s found potential location: '%s'", i+1, location)
+                
+                # Clean the location and check if it's valid
+                location_clean = location.lower()
+                location_words = location_clean.split()
+                
+                # Strict filtering of non-locations: no word may be a non-location
+                if (_NON_LOCATIONS.isdisjoint(location_words) and 
+                    len(location_clean) > 2 and 
+                    not any(phrase in location_clean for phrase in _BAD_LOCATION_PHRASES)):
                     
-                    # Additional checks for valid locations
-                    if (is_valid_location and 
-                        len(location_clean) > 2 and 
-                        location_clean not in non_locations and
-                        not any(phrase in location_clean for phrase in ['help you', 'find the', 'perfect airbnb'])):
-                        
-                        # Capitalize properly for URL
-                        params.location = location.title()
-                        print(f"DEBUG - Accepted location: '{params.location}'")
-                        break
-                    else:
-                        print(f"DEBUG - Rejected location: '{location}' (failed validation)")
-    
-    # Guest count patterns
-    guest_patterns = [
-        r"(\d+)\s+(?:people|guests?|person|adults?)",
-        r"(?:for|with)\s+(\d+)",
-        r"(\d+)\s+of us"
-    ]
+                    # Capitalize properly for URL
+                    params.location = location.title()
+                    logger.debug("Accepted location: '%s'", params.location)
+                    break
+                else:
+                    logger.debug("Rejected location: '%s' (failed validation)", location)
+            if params.location:
+                break
     
-    for pattern in guest_patterns:
-        match = re.search(pattern, conversation_text, re.IGNORECASE)
+    # Guest count
+    for pattern in _GUEST_PATTERNS:
+        match = pattern.search(conversation_lower)
         if match and not params.guests:
             params.guests = int(match.group(1))
             break
     
-    # Budget patterns - improved to handle "70 USD max" properly
-    budget_patterns = [
-        r"(\d+)\s*(?:usd|USD|dollars?)\s*(?:max|maximum|per\s*day\s*max)",  # "70 USD max", "70 dollars max"
-        r"(\d+)\s*(?:per\s*day|daily|nightly?)\s*(?:max|maximum)",  # "70 per day max"
-        r"max(?:imum)?\s*(?:of\s*)?(?:usd\s*)?(?:\$)?(\d+)",  # "maximum $70", "max of 70"
-        r"under\s*(?:\$)?(\d+)",  # "under $70"
-        r"below\s*(?:\$)?(\d+)",  # "below 70"
-        r"up\s*to\s*(?:\$)?(\d+)",  # "up to 70"
-        r"(\d+)\s*(?:kzt|tenge)",  # KZT currency
-        r"\$(\d+)(?:\s*-\s*\$?(\d+))?",  # $70-100 or $70
-        r"(\d+)\s*(?:to|through|-)\s*(\d+)\s*(?:dollars?|\$)",  # 70 to 100 dollars
-        r"budget\s+(?:of\s+)?(?:around\s+)?\$?(\d+)",  # budget of $70
-    ]
-    
-    for pattern in budget_patterns:
-        match = re.search(pattern, conversation_text, re.IGNORECASE)
+    # Budget - improved to handle "70 USD max" properly
+    for pattern, kind in _BUDGET_PATTERNS:
+        match = pattern.search(conversation_lower)
         if match and not params.min_price and not params.max_price:
-            print(f"DEBUG - Budget pattern matched: '{match.group(0)}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Budget pattern matched: '%s'", match.group(0))
             
-            if 'kzt' in pattern.lower() or 'tenge' in pattern.lower():
-                # Convert KZT to USD (rough approximation: 1 USD = 450 KZT)
+            if kind == "kzt":
+                # Convert KZT to USD (rough approximation)
                 kzt_amount = int(match.group(1))
-                usd_amount = kzt_amount // 450
+                usd_amount = kzt_amount // _KZT_PER_USD
                 params.max_price = usd_amount
-                print(f"DEBUG - Converted {kzt_amount} KZT to ~${usd_amount} USD")
+                logger.debug("Converted %s KZT to ~$%s USD", kzt_amount, usd_amount)
             elif match.lastindex >= 2 and match.group(2):  # Range found (two numbers)
                 params.min_price = int(match.group(1))
                 params.max_price = int(match.group(2))
-                print(f"DEBUG - Price range extracted: ${params.min_price}-${params.max_price}")
+                logger.debug("Price range extracted: $%s-$%s", params.min_price, params.max_price)
             else:  # Single price found
                 price = int(match.group(1))
-                pattern_text = match.group(0).lower()
                 
                 # Check if this is a maximum constraint
-                if any(word in pattern_text for word in ["max", "under", "below", "up to"]):
+                if kind == "max":
                     params.max_price = price
-                    print(f"DEBUG - Maximum price extracted: ${params.max_price}")
+                    logger.debug("Maximum price extracted: $%s", params.max_price)
                 else:
                     # Budget around this price
                     params.min_price = max(20, price - 30)
                     params.max_price = price + 30
-                    print(f"DEBUG - Budget around ${price} extracted: ${params.min_price}-${params.max_price}")
+                    logger.debug("Budget around $%s extracted: $%s-$%s", price, params.min_price, params.max_price)
             break
     
-    # Property type patterns
-    property_patterns = [
-        r"\b(house|houses|home|homes)\b",
-        r"\b(apartment|apartments|apt|apts)\b",
-        r"\b(villa|villas)\b",
-        r"\b(cabin|cabins)\b",
-        r"\b(loft|lofts)\b",
-        r"\b(cottage|cottages)\b"
-    ]
-    
-    property_mapping = {
-        'house': 'house', 'houses': 'house', 'home': 'house', 'homes': 'house',
-        'apartment': 'apartment', 'apartments': 'apartment', 'apt': 'apartment', 'apts': 'apartment',
-        'villa': 'villa', 'villas': 'villa',
-        'cabin': 'cabin', 'cabins': 'cabin',
-        'loft': 'loft', 'lofts': 'loft',
-        'cottage': 'cottage', 'cottages': 'cottage'
-    }
-    
-    for pattern in property_patterns:
-        match = re.search(pattern, conversation_text, re.IGNORECASE)
-        if match and not params.property_type:
-            matched_type = match.group(1).lower()
-            if matched_type in property_mapping:
-                params.property_type = property_mapping[matched_type]
-                break
-    
-    # Amenity patterns
-    amenity_patterns = {
-        'wifi': r'\b(wifi|wi-fi|internet|wireless)\b',
-        'kitchen': r'\b(kitchen|cook|cooking|kitchenette)\b',
-        'pool': r'\b(pool|swimming|swim)\b',
-        'parking': r'\b(parking|garage|park)\b',
-        'air_conditioning': r'\b(air\s*conditioning|ac|a/c|cool|cooling)\b',
-        'washer': r'\b(washer|washing|laundry)\b',
-        'hot_tub': r'\b(hot\s*tub|jacuzzi|spa)\b',
-        'gym': r'\b(gym|fitness|workout)\b',
-        'pets_allowed': r'\b(pet|pets|dog|cat|pet-friendly)\b'
-    }
-    
-    detected_amenities = []
-    for amenity, pattern in amenity_patterns.items():
-        if re.search(pattern, conversation_text, re.IGNORECASE):
-            detected_amenities.append(amenity)
+    # Property type - one scan for every property word, then a flat lookup
+    mentioned_types = {_PROPERTY_MAPPING[word] for word in _PROPERTY_RE.findall(conversation_lower)}
+    for property_type in _PROPERTY_TYPE_ORDER:
+        if property_type in mentioned_types:
+            params.property_type = property_type
+            break
     
-    if detected_amenities:
-        params.amenities = detected_amenities
+    # Amenities - one pass over the text, reported in declaration order
+    found_amenities = {match.lastgroup for match in _AMENITY_RE.finditer(conversation_lower)}
+    if found_amenities:
+        params.amenities = [amenity for amenity in _AMENITY_NAMES if amenity in found_amenities]
     
-    print(f"DEBUG - Final extracted params: location='{params.location}', dates={params.checkin} to {params.checkout}, guests={params.guests}, price_max={params.max_price}, property_type='{params.property_type}'")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final extracted params: location='%s', dates=%s to %s, guests=%s, price_max=%s, property_type='%s'", params.location, params.checkin, params.checkout, params.guests, params.max_price, params.property_type)
     
     return params 
 
-def extract_search_params(conversation_text: str) -> SearchParams:
-    """Extract search parameters from conversation text - optimized for speed"""
+def extract_search_params(conversation_text: str, allow_llm: bool = True) -> SearchParams:
+    """Extract search parameters from conversation text - optimized for speed.
     
-    # Try fast regex extraction first
-    params = extract_search_params_regex(conversation_text)
+    allow_llm=False keeps extraction regex-only, even for input the LLM would otherwise handle.
+    """
+    # Try fast regex extraction first. Callers fix up the params in place, so never hand out the cached instance
+    params = _extract_search_params_regex_cached(conversation_text, date.today()).copy()
     
     # Only use expensive LLM if we have complex input and missing critical info
     needs_llm = (
+        allow_llm and
         not params.location and  # No location found
         len(conversation_text) > 50 and  # Complex enough to warrant LLM
-        any(keyword in conversation_text.lower() for keyword in [
-            'accommodation', 'travel', 'trip', 'visit', 'booking', 'stay'
-        ])
+        _LLM_HINT_RE.search(conversation_text) is not None
     )
     
     if needs_llm:
-        print("DEBUG - Using LLM for complex parameter extraction")
+        logger.debug("Using LLM for complex parameter extraction")
         llm_params = extract_search_params_with_llm(conversation_text)
         # Merge results - prioritize LLM location if regex failed
         if llm_params.location and not params.location:
@@ -437,6 +535,15 @@ def extract_search_params(conversation_text: str) -> SearchParams:
         if llm_params.max_price and not params.max_price:
             params.max_price = llm_params.max_price
     else:
-        print("DEBUG - Using fast regex extraction only")
+        logger.debug("Using fast regex extraction only")
+    
+    return params
+
+@lru_cache(maxsize=4096)
+def _extract_search_params_regex_cached(conversation_text: str, today: date) -> SearchParams:
+    """Regex extraction memoized for repeated conversations.
     
-    return params 
\ No newline at end of file
+    Resolved dates depend on the current day, so today is part of the key and entries from
+    earlier days are never served. LLM results are cached separately, and only on success.
+    """
+    return extract_search_params_regex(conversation_text)
\ No newline at end of file
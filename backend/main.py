@@ -1,23 +1,35 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import logging
+import orjson
 import os
-from groq import Groq
 from dotenv import load_dotenv
 import re
-from datetime import datetime, timedelta
 import time
+from urllib.parse import urlencode
 
 # Import our modular components
 from models import ChatMessage, ChatResponse
-from extractors import extract_search_params
+from extractors import extract_search_params, get_async_groq_client
 from validators import validate_and_fix_params, should_trigger_search, should_show_confirmation, get_missing_params_message
 from scrapers import scrape_airbnb_listings
-from utils import build_airbnb_url, get_persona_prompt, format_search_confirmation
+from utils import build_airbnb_url, PERSONA_PROMPT, format_search_confirmation, get_default_dates
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Confind Backend", description="AI Assistant for Airbnb Listings")
+# Debug output is off unless LOG_LEVEL=DEBUG is set
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
+
+app = FastAPI(
+    title="Confind Backend",
+    description="AI Assistant for Airbnb Listings",
+    default_response_class=ORJSONResponse,  # orjson serializes responses much faster than stdlib json
+)
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -26,163 +38,222 @@ app.add_middleware(
         "http://localhost:5173", 
         "http://localhost:3000",
         "https://confind.vercel.app",  # Add your Vercel domain
-        "*"  # For development only
     ],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Browsers may cache preflight responses for a day
+)
+
+# Compress larger JSON bodies (replies with search results); small ones aren't worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Room ID formats: /rooms/<id>, listing_<id>, or /<id>? before query params
+_ROOM_ID_RE = re.compile(r'/rooms/(\d+)|listing_(\d+)|/(\d+)\?')
+
+# Prompt budget for the reply: only the last 3 exchanges are resent, each message capped in length,
+# so Groq input tokens stay flat however long the conversation gets
+_HISTORY_WINDOW = 6
+_MAX_HISTORY_MESSAGE_CHARS = 1000
+
+# Words that make a message likely to be a search. Plain substrings (no word boundaries),
+# so "staying" or "needs" count too, found in a single scan
+_SEARCH_KEYWORD_RE = re.compile(
+    r'apartment|hotel|house|place|stay|accommodation|rent|booking|airbnb|'
+    r'location|city|travel|trip|visit|budget|price|people|guests|'
+    r'search|find|looking|need|want',
+    re.IGNORECASE,
 )
 
-# Initialize Groq client
-def get_groq_client():
-    return Groq(api_key=os.getenv("GROQ_API_KEY"))
+# Groq settings for the chat reply, shared by /chat and /chat/stream
+_REPLY_COMPLETION_ARGS = dict(
+    model="llama-3.1-8b-instant",
+    temperature=0.7,
+    max_tokens=300,  # Reduced from 400 for faster response
+    top_p=1,
+)
 
 @app.get("/")
 async def root():
     return {"message": "Confind Backend is running!"}
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(chat_data: ChatMessage):
-    start_time = time.time()
+# The Groq reply is awaited on the event loop; blocking work (extraction with its sync LLM
+# fallback, scraping) goes to the threadpool so other chats keep being served
+async def _prepare_chat(chat_data: ChatMessage, skip_llm: bool) -> tuple:
+    """Extract parameters, search if the user is ready, and build the Groq messages for the reply.
     
-    try:
-        # Quick check if this is likely a search query BEFORE expensive processing
-        message_lower = chat_data.message.lower()
-        is_likely_search = any(keyword in message_lower for keyword in [
-            'apartment', 'hotel', 'house', 'place', 'stay', 'accommodation', 'rent', 'booking', 'airbnb',
-            'location', 'city', 'travel', 'trip', 'visit', 'budget', 'price', 'people', 'guests',
-            'search', 'find', 'looking', 'need', 'want'
-        ])
+    Returns (messages, search_results); shared by /chat and /chat/stream.
+    """
+    # Quick check if this is likely a search query BEFORE expensive processing
+    is_likely_search = _SEARCH_KEYWORD_RE.search(chat_data.message) is not None
+    
+    logger.debug("Quick search check: %s for message: '%s...'", is_likely_search, chat_data.message[:100])
+    
+    # Only do expensive parameter extraction if likely a search
+    if is_likely_search:
+        # Extract search parameters from USER messages only (not mixed conversation)
+        user_messages = [msg["text"] for msg in chat_data.conversation_history if msg["sender"] == "user"]
+        user_messages.append(chat_data.message)  # Add current user message
+        user_conversation = " ".join(user_messages)
         
-        print(f"DEBUG - Quick search check: {is_likely_search} for message: '{chat_data.message[:100]}...'")
+        logger.debug("User messages only: %s", user_conversation)
         
-        # Only do expensive parameter extraction if likely a search
-        if is_likely_search:
-            # Extract search parameters from USER messages only (not mixed conversation)
-            user_messages = [msg["text"] for msg in chat_data.conversation_history if msg["sender"] == "user"]
-            user_messages.append(chat_data.message)  # Add current user message
-            user_conversation = " ".join(user_messages)
-            
-            print(f"DEBUG - User messages only: {user_conversation}")
-            
-            search_params = extract_search_params(user_conversation)
-            
-            # Validate and fix the extracted parameters
-            search_params = validate_and_fix_params(search_params, user_conversation)
-            
-            # Debug: Print extracted parameters
-            print(f"DEBUG - Full conversation: {user_conversation}")
-            print(f"DEBUG - Extracted location: {search_params.location}")
-            print(f"DEBUG - Extracted guests: {search_params.guests}")
-            print(f"DEBUG - Extracted price range: ${search_params.min_price}-${search_params.max_price}")
-            
-            # NEW: Check if we should show confirmation before searching
-            should_confirm = should_show_confirmation(search_params, chat_data.conversation_history)
-            should_search = should_trigger_search(
-                chat_data.message, 
-                search_params, 
-                chat_data.conversation_history
-            )
-        else:
-            # Skip expensive parameter extraction for non-search queries
-            from models import SearchParams
-            search_params = SearchParams()
-            should_confirm = False
-            should_search = False
+        # ?skip_llm=1 lets the client trade LLM fallback extraction for latency
+        search_params = await run_in_threadpool(extract_search_params, user_conversation, allow_llm=not skip_llm)
         
-        print(f"DEBUG - Should show confirmation: {should_confirm}")
-        print(f"DEBUG - Should trigger search: {should_search}")
+        # Validate and fix the extracted parameters
+        search_params = validate_and_fix_params(search_params, user_conversation)
         
-        search_results = None
-        persona_prompt = get_persona_prompt()
+        # Debug: Print extracted parameters
+        logger.debug("Full conversation: %s", user_conversation)
+        logger.debug("Extracted location: %s", search_params.location)
+        logger.debug("Extracted guests: %s", search_params.guests)
+        logger.debug("Extracted price range: $%s-$%s", search_params.min_price, search_params.max_price)
         
-        if should_search and search_params.location:
-            # User confirmed - proceed with search
-            try:
-                # Build search URL and scrape results
-                search_url = build_airbnb_url(search_params)
-                print(f"DEBUG - Generated URL: {search_url}")
-                search_results = scrape_airbnb_listings(search_url)
-                
-                # Create enhanced prompt with actual search results
-                if search_results and len(search_results) > 0:
-                    search_context = f"\n\nSEARCH COMPLETED: I found {len(search_results)} properties for {search_params.location}"
-                    if search_params.guests:
-                        search_context += f" for {search_params.guests} guests"
-                    if search_params.min_price or search_params.max_price:
-                        search_context += f" with budget ${search_params.min_price or 0}-${search_params.max_price or '∞'}"
-                    
-                    search_context += f". The frontend will display the actual search results automatically. JUST SAY something like 'I found {len(search_results)} great options for you!' - DO NOT list fake properties or make up details. The real properties will be shown by the system."
-                else:
-                    search_context = f"\n\nSEARCH COMPLETED: No properties found for {search_params.location} with the specified criteria. Suggest adjusting the search parameters or trying a different location."
+        # NEW: Check if we should show confirmation before searching
+        should_confirm = should_show_confirmation(search_params, chat_data.conversation_history)
+        should_search = should_trigger_search(
+            chat_data.message, 
+            search_params, 
+            chat_data.conversation_history
+        )
+    else:
+        # Skip expensive parameter extraction for non-search queries
+        from models import SearchParams
+        search_params = SearchParams()
+        should_confirm = False
+        should_search = False
+    
+    logger.debug("Should show confirmation: %s", should_confirm)
+    logger.debug("Should trigger search: %s", should_search)
+    
+    search_results = None
+    # Per-turn instructions for the reply, sent after the static persona prompt
+    search_context = ""
+    
+    if should_search and search_params.location:
+        # User confirmed - proceed with search
+        try:
+            # Build search URL and scrape results
+            search_url = build_airbnb_url(search_params)
+            logger.debug("Generated URL: %s", search_url)
+            search_results = await run_in_threadpool(scrape_airbnb_listings, search_url)
+            
+            # Create enhanced prompt with actual search results
+            if search_results and len(search_results) > 0:
+                search_context = f"SEARCH COMPLETED: I found {len(search_results)} properties for {search_params.location}"
+                if search_params.guests:
+                    search_context += f" for {search_params.guests} guests"
+                if search_params.min_price or search_params.max_price:
+                    search_context += f" with budget ${search_params.min_price or 0}-${search_params.max_price or '∞'}"
                 
-                persona_prompt = get_persona_prompt(search_context)
-            except Exception as e:
-                print(f"DEBUG - Search error: {e}")
-                persona_prompt = get_persona_prompt(f"\n\nNOTE: Search attempted but encountered issues. Acknowledge this and offer to try again or help in other ways.")
-        
-        elif should_confirm and search_params.location:
-            # Show confirmation before searching
-            confirmation_message = format_search_confirmation(search_params)
-            persona_prompt = get_persona_prompt(f"\n\nCONTEXT: Show this confirmation message to the user: '{confirmation_message}'. Do not search yet - wait for their confirmation.")
-        
-        else:
-            # Add context about missing information
-            if is_likely_search:
-                missing_info = get_missing_params_message(search_params)
-                persona_prompt = get_persona_prompt(f"\n\nCONTEXT: {missing_info}")
+                search_context += f". The frontend will display the actual search results automatically. JUST SAY something like 'I found {len(search_results)} great options for you!' - DO NOT list fake properties or make up details. The real properties will be shown by the system."
             else:
-                # Regular conversation
-                persona_prompt = get_persona_prompt()
-        
-        # Build conversation history for context (limit to last 6 messages for speed)
-        messages = [{"role": "system", "content": persona_prompt}]
-        
-        # Add only recent conversation history (last 3 exchanges = 6 messages max)
-        recent_history = chat_data.conversation_history[-6:] if len(chat_data.conversation_history) > 6 else chat_data.conversation_history
-        
-        for msg in recent_history:
-            messages.append({
-                "role": "user" if msg["sender"] == "user" else "assistant",
-                "content": msg["text"]
-            })
-        
-        # Add current message
-        messages.append({"role": "user", "content": chat_data.message})
+                search_context = f"SEARCH COMPLETED: No properties found for {search_params.location} with the specified criteria. Suggest adjusting the search parameters or trying a different location."
+        except Exception as e:
+            logger.warning("Search error: %s", e)
+            search_context = "NOTE: Search attempted but encountered issues. Acknowledge this and offer to try again or help in other ways."
+    
+    elif should_confirm and search_params.location:
+        # Show confirmation before searching
+        confirmation_message = format_search_confirmation(search_params)
+        search_context = f"CONTEXT: Show this confirmation message to the user: '{confirmation_message}'. Do not search yet - wait for their confirmation."
+    
+    elif is_likely_search:
+        # Add context about missing information
+        missing_info = get_missing_params_message(search_params)
+        search_context = f"CONTEXT: {missing_info}"
+    
+    # Build conversation history for context (limit to last 6 messages for speed)
+    messages = [{"role": "system", "content": PERSONA_PROMPT}]
+    if search_context:
+        messages.append({"role": "system", "content": search_context})
+    
+    # Add only recent conversation history (last 3 exchanges = 6 messages max), then the current message
+    messages.extend([
+        {"role": "user" if msg["sender"] == "user" else "assistant", "content": msg["text"][:_MAX_HISTORY_MESSAGE_CHARS]}
+        for msg in chat_data.conversation_history[-_HISTORY_WINDOW:]
+    ])
+    messages.append({"role": "user", "content": chat_data.message})
+    
+    return messages, search_results
+
+# The ChatResponse shape is documented, not enforced: the body is built here from trusted values,
+# so it's returned as an ORJSONResponse directly instead of being revalidated and re-encoded
+@app.post("/chat", responses={200: {"model": ChatResponse}})
+async def chat(chat_data: ChatMessage, skip_llm: bool = False):
+    start_time = time.time()
+    
+    try:
+        messages, search_results = await _prepare_chat(chat_data, skip_llm)
         
         processing_time = time.time() - start_time
-        print(f"DEBUG - Processing time before Groq API: {processing_time:.2f}s")
+        logger.debug("Processing time before Groq API: %.2fs", processing_time)
         
         # Call Groq API with timeout
         groq_start = time.time()
-        completion = get_groq_client().chat.completions.create(
-            model="llama-3.1-8b-instant",
+        completion = await get_async_groq_client().chat.completions.create(
             messages=messages,
-            temperature=0.7,
-            max_tokens=300,  # Reduced from 400 for faster response
-            top_p=1,
-            stream=False
+            stream=False,
+            **_REPLY_COMPLETION_ARGS
         )
         
         groq_time = time.time() - groq_start
-        print(f"DEBUG - Groq API time: {groq_time:.2f}s")
+        logger.debug("Groq API time: %.2fs", groq_time)
         
         response_text = completion.choices[0].message.content
         
         total_time = time.time() - start_time
-        print(f"DEBUG - Total response time: {total_time:.2f}s")
+        logger.debug("Total response time: %.2fs", total_time)
         
-        return ChatResponse(
-            response=response_text,
-            status="success",
-            search_results=search_results
-        )
+        return ORJSONResponse({
+            "response": response_text,
+            "status": "success",
+            "search_results": search_results
+        })
         
     except Exception as e:
         total_time = time.time() - start_time
-        print(f"DEBUG - Error after {total_time:.2f}s: {e}")
+        logger.warning("Error after %.2fs: %s", total_time, e)
         raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_stream(chat_data: ChatMessage, skip_llm: bool = False):
+    """
+    Same as /chat, but streams the reply as server-sent events while Groq generates it:
+    `data: {"delta": ...}` per text chunk, then one `event: meta` with status and search_results
+    (or `event: error` if generation fails midway)
+    """
+    try:
+        messages, search_results = await _prepare_chat(chat_data, skip_llm)
+        stream = await get_async_groq_client().chat.completions.create(
+            messages=messages,
+            stream=True,
+            **_REPLY_COMPLETION_ARGS
+        )
+    except Exception as e:
+        logger.warning("Stream setup error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error processing chat: {str(e)}")
+    
+    async def events():
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+            yield b"event: meta\ndata: " + orjson.dumps({"status": "success", "search_results": search_results}) + b"\n\n"
+        except Exception as e:
+            logger.warning("Stream error: %s", e)
+            yield b"event: error\ndata: " + orjson.dumps({"detail": f"Error processing chat: {str(e)}"}) + b"\n\n"
+    
+    # An explicit Content-Encoding makes GZipMiddleware pass the stream through; gzip would hold
+    # the events back in its buffer instead of sending each one as it's generated
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"},
+    )
+
 @app.post("/choose-property")
 async def choose_property(request_data: dict):
     """
@@ -269,28 +340,16 @@ def generate_airbnb_urls(listing_url, search_params=None):
     # Generate message host URL with proper format
     guests = search_params.get('guests', 2)
     
-    # Build contact host URL parameters
-    contact_params = [f"adults={guests}"]
+    # Resolve the stay dates once for both URLs
+    checkin_date, checkout_date = resolve_stay_dates(search_params)
     
-    # Add dates - prioritize extracted dates over defaults
-    checkin_date = search_params.get('checkin') or search_params.get('check_in')
-    checkout_date = search_params.get('checkout') or search_params.get('check_out')
-    
-    if checkin_date and checkout_date:
-        contact_params.extend([f"check_in={checkin_date}", f"check_out={checkout_date}"])
-        print(f"DEBUG - Using extracted dates for contact: {checkin_date} to {checkout_date}")
-    else:
-        # Add default dates only if none provided
-        check_in = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-        check_out = (datetime.now() + timedelta(days=10)).strftime('%Y-%m-%d')
-        contact_params.extend([f"check_in={check_in}", f"check_out={check_out}"])
-        print(f"DEBUG - Using default dates for contact: {check_in} to {check_out}")
-    
-    contact_query = "&".join(contact_params)
+    # Build contact host URL parameters
+    contact_params = {"adults": guests, "check_in": checkin_date, "check_out": checkout_date}
+    contact_query = urlencode(contact_params)
     message_host_url = f"https://www.airbnb.com/contact_host/{room_id}/send_message?{contact_query}"
     
     # Generate booking URL with proper format
-    booking_url = generate_booking_url(room_id, search_params)
+    booking_url = generate_booking_url(room_id, search_params, checkin_date, checkout_date)
     
     return {
         "message_host_url": message_host_url,
@@ -303,54 +362,55 @@ def extract_room_id(airbnb_url):
     Extract room ID from various Airbnb URL formats
     """
     try:
-        patterns = [
-            r'/rooms/(\d+)',  # Standard format
-            r'listing_(\d+)',  # Alternative format
-            r'/(\d+)\?',  # Room ID before query params
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, airbnb_url)
-            if match:
-                return match.group(1)
+        match = _ROOM_ID_RE.search(airbnb_url)
+        if match:
+            return next(group for group in match.groups() if group)
         
         return None
     except Exception:
         return None
 
-def generate_booking_url(room_id, search_params):
+def resolve_stay_dates(search_params):
+    """
+    Check-in/check-out for the booking links - extracted dates when both are given, else the defaults
+    """
+    checkin_date = search_params.get('checkin') or search_params.get('check_in')
+    checkout_date = search_params.get('checkout') or search_params.get('check_out')
+    
+    if checkin_date and checkout_date:
+        logger.debug("Using extracted dates: %s to %s", checkin_date, checkout_date)
+        return checkin_date, checkout_date
+    
+    # Add default dates only if none provided
+    checkin_date, checkout_date = get_default_dates()
+    logger.debug("Using default dates: %s to %s", checkin_date, checkout_date)
+    return checkin_date, checkout_date
+
+def generate_booking_url(room_id, search_params, checkin_date=None, checkout_date=None):
     """
-    Generate booking URL with search parameters using working format
+    Generate booking URL with search parameters using working format.
+    Pass checkin_date/checkout_date when already resolved; otherwise they come from search_params
     """
     guests = search_params.get('guests', 2)
     
     # Build query parameters using the exact working format
-    params = [
-        f"numberOfAdults={guests}",
-        f"guestCurrency=USD",
-        f"productId={room_id}",
-        f"isWorkTrip=false",
-        f"numberOfChildren=0",
-        f"numberOfGuests={guests}",
-        f"numberOfInfants=0",
-        f"numberOfPets=0"
-    ]
+    params = {
+        "numberOfAdults": guests,
+        "guestCurrency": "USD",
+        "productId": room_id,
+        "isWorkTrip": "false",
+        "numberOfChildren": 0,
+        "numberOfGuests": guests,
+        "numberOfInfants": 0,
+        "numberOfPets": 0
+    }
     
     # Add dates - prioritize extracted dates over defaults
-    checkin_date = search_params.get('checkin') or search_params.get('check_in')
-    checkout_date = search_params.get('checkout') or search_params.get('check_out')
-    
-    if checkin_date and checkout_date:
-        params.extend([f"checkin={checkin_date}", f"checkout={checkout_date}"])
-        print(f"DEBUG - Using extracted dates for booking: {checkin_date} to {checkout_date}")
-    else:
-        # Add default dates only if none provided
-        check_in = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-        check_out = (datetime.now() + timedelta(days=10)).strftime('%Y-%m-%d')
-        params.extend([f"checkin={check_in}", f"checkout={check_out}"])
-        print(f"DEBUG - Using default dates for booking: {check_in} to {check_out}")
+    if not (checkin_date and checkout_date):
+        checkin_date, checkout_date = resolve_stay_dates(search_params)
+    params.update(checkin=checkin_date, checkout=checkout_date)
     
-    query_string = "&".join(params)
+    query_string = urlencode(params)
     
     # Use the exact working format
     return f"https://www.airbnb.com/book/stays/{room_id}?{query_string}"
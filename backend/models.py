@@ -1,3 +1,4 @@
+from dataclasses import dataclass, replace
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 
@@ -11,8 +12,10 @@ class ChatResponse(BaseModel):
     status: str
     search_results: Optional[List[Dict]] = None
 
-# Search parameters model
-class SearchParams(BaseModel):
+# Search parameters - internal only (never parsed from or sent to the API), so a slotted
+# dataclass is enough; extraction creates and fills one on every chat message
+@dataclass(slots=True)
+class SearchParams:
     location: Optional[str] = None
     checkin: Optional[str] = None
     checkout: Optional[str] = None
@@ -22,6 +25,10 @@ class SearchParams(BaseModel):
     property_type: Optional[str] = None
     amenities: Optional[List[str]] = None
 
+    def copy(self) -> "SearchParams":
+        """Independent copy - the amenities list is the only mutable field"""
+        return replace(self, amenities=list(self.amenities) if self.amenities is not None else None)
+
 # Airbnb amenity IDs and constants
 AIRBNB_AMENITIES = {
     'wifi': 4,
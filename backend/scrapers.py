@@ -1,8 +1,13 @@
 import re
 import time
-import requests
+import logging
+import httpx
 import os
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from cachetools import TTLCache
 from bs4 import BeautifulSoup
+import soupsieve
 from typing import List, Dict
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -10,22 +15,184 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 import atexit
 
-# Global driver cache for reuse
-_driver_cache = None
+logger = logging.getLogger(__name__)
+
+# Warm Chrome drivers kept between searches, per worker process; each search takes one out, so
+# concurrent searches never share a browser. At most SELENIUM_POOL_SIZE browsers are alive at once
+# (at least one) - further searches wait up to _DRIVER_WAIT_TIMEOUT for a free driver. Idle drivers
+# are quit after SELENIUM_IDLE_TIMEOUT seconds so an idle worker doesn't hold a browser's memory.
+# SELENIUM_POOL_SIZE=0 quits every driver after its search
+_DRIVER_POOL_SIZE = max(0, int(os.environ.get('SELENIUM_POOL_SIZE', '1')))
+_DRIVER_IDLE_TIMEOUT = float(os.environ.get('SELENIUM_IDLE_TIMEOUT', '120'))
+_DRIVER_WAIT_TIMEOUT = 10
+_MAX_LIVE_DRIVERS = max(1, _DRIVER_POOL_SIZE)
+_driver_cond = threading.Condition()
+_idle_drivers = []  # (driver, monotonic time it was returned), most recently returned last
+_live_driver_count = 0
+_driver_reaper = None
+_driver_reaper_stop = threading.Event()
+
+# Shared HTTP/2 client for the requests scraper: keeps one multiplexed TLS connection to Airbnb
+# alive between searches. Only connection failures are retried, so a slow page can't eat the time budget
+_http_client = httpx.Client(
+    headers={
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+    },
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=60.0),
+    ),
+    timeout=httpx.Timeout(5.0),  # Reduced from 10 to 5 seconds
+    follow_redirects=True,
+)
+
+# Scraped listings per canonical search URL; Airbnb results are fine to reuse for a few minutes
+_scrape_cache = TTLCache(maxsize=512, ttl=300)
+_scrape_cache_lock = threading.Lock()
+
+def _canonical_search_url(search_url: str) -> str:
+    """Search URL with its query parameters sorted, so equivalent searches share a cache entry"""
+    parts = urlsplit(search_url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+# Most of a search page the requests scraper will download and parse
+_MAX_PAGE_BYTES = 1024 * 1024
+
+# Text matchers for the requests/BeautifulSoup fallback, compiled once
+_PRICE_TEXT_RE = re.compile(r'\$\d+')
+_RATING_TEXT_RE = re.compile(r'\d+\.\d+')
+# Strings read past a listing that has no card container around it when looking for its price/rating
+_NEXT_STRINGS_LIMIT = 60
+
+# Listing containers for the requests fallback (Airbnb structure changes frequently), in order of
+# preference. The page is walked once with the combined selector and each hit is then sorted
+# into the selectors it matches
+_LISTING_SELECTORS = [
+    '[data-testid="listing-card-title"]',
+    '[data-testid="card-container"]',
+    '.c4mnd7m',  # Common Airbnb class
+    '[aria-label*="listing"]'
+]
+_LISTING_SELECTOR_PATTERNS = [soupsieve.compile(selector) for selector in _LISTING_SELECTORS]
+_ANY_LISTING_SELECTOR = soupsieve.compile(', '.join(_LISTING_SELECTORS))
+
+# Listing containers on the Selenium-rendered page, queried as one comma-joined selector
+_SELENIUM_LISTING_SELECTOR = ", ".join([
+    "[data-testid='card-container']",  # Primary listing card container
+    "[role='group'][aria-label*='listing']",  # Listing groups
+    "[role='group'][aria-label*='property']",  # Property groups
+    ".atm_9s_1txwivl[data-testid]",  # Elements with data-testid (more likely to be listings)
+    ".l1ovpqvx",  # Another common listing class
+    ".atm_gi_1n1ank9",  # Alternative listing container
+])
+
+def _xpath_has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Per-card field candidates for the Selenium scraper, each as one card-scoped XPath union
+# (leading '.'), so a card field is a single query whose matches come back in document order
+_TITLE_XPATH = ".//*[" + " or ".join([
+    "@data-testid='listing-card-title'",
+    _xpath_has_class("atm_7l_jt7fhx"),
+    "self::h3",
+    _xpath_has_class("t1jojoys"),
+    "@role='heading'",
+]) + "]"
+_PRICE_XPATH = ".//*[" + " or ".join([
+    "@data-testid='price-availability'",
+    _xpath_has_class("atm_7h_hxbz6r"),
+    _xpath_has_class("a8jt5op"),
+    "contains(@aria-label, 'price')",
+    "(self::span and @aria-hidden='true')",  # Common for price text
+]) + "]"
+_RATING_XPATH = ".//*[" + " or ".join([
+    "@data-testid='listing-card-subtitle'",
+    _xpath_has_class("r1dxllyb"),
+    _xpath_has_class("atm_3f_glywfm"),
+    "contains(@aria-label, 'rating')",
+    "contains(@aria-label, 'star')",
+]) + "]"
+
+# Reads every listing card in the page in a single execute_script round trip instead of one
+# WebDriver request per element, selector and .text read. Returns, per card in document order:
+# its text, first link and the texts matched by the title/price/rating XPaths - the Python side
+# keeps the filtering and fallbacks
+_COLLECT_LISTINGS_JS = """
+const [listingSelector, titleXPath, priceXPath, ratingXPath] = arguments;
+const textOf = (el) => el.innerText || '';
+const xpathTexts = (card, xpath) => {
+    const found = document.evaluate(xpath, card, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const texts = [];
+    for (let i = 0; i < found.snapshotLength; i++) {
+        texts.push(textOf(found.snapshotItem(i)));
+    }
+    return texts;
+};
+return Array.from(document.querySelectorAll(listingSelector), (card) => {
+    const link = card.querySelector('a');
+    return {
+        text: textOf(card),
+        href: link ? link.href : null,
+        titles: xpathTexts(card, titleXPath),
+        prices: xpathTexts(card, priceXPath),
+        ratings: xpathTexts(card, ratingXPath),
+    };
+});
+"""
+
+# Text of search-interface elements that also match the listing selectors, found in one scan
+_SKIP_PHRASES = [
+    "Start your search", "Check in", "Check out", "Guests",
+    "Filters", "filters applied", "Become a host", "Location",
+    "Homes in", "Total before taxes", "Display total before taxes"
+]
+_SKIP_RE = re.compile("|".join(map(re.escape, _SKIP_PHRASES)))
+
+# Price/rating patterns searched in a card's text when no price/rating element is found, in order
+_PRICE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\$\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
+    r'€\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
+    r'₽\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
+    r'\$\d+',  # Simple dollar amount
+    r'€\d+',   # Simple euro amount
+    r'₽\d+'    # Simple ruble amount
+)]
+_RATING_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\d+\.\d+\s*(?:★|⭐|stars?)',
+    r'★\s*\d+\.\d+',
+    r'⭐\s*\d+\.\d+',
+    r'\d+\.\d+\s*\(\d+\)',  # 4.5 (123) format
+    r'\d+\.\d+\s*•\s*\d+\s*reviews?',  # 4.5 • 123 reviews format
+    r'\d+\.\d+'  # Simple decimal rating
+)]
+
+# Requests the Selenium browser never needs to make for scraping listing text
+_BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+]
 
 def cleanup_driver():
-    """Cleanup driver on exit"""
-    global _driver_cache
-    if _driver_cache:
-        try:
-            _driver_cache.quit()
-        except:
-            pass
-        _driver_cache = None
+    """Cleanup pooled drivers on exit"""
+    global _live_driver_count
+    _driver_reaper_stop.set()
+    with _driver_cond:
+        drivers = [driver for driver, _ in _idle_drivers]
+        _idle_drivers.clear()
+        _live_driver_count -= len(drivers)
+    for driver in drivers:
+        _quit_driver(driver)
 
 # Register cleanup
 atexit.register(cleanup_driver)
@@ -75,59 +242,142 @@ def get_chrome_options():
     chrome_binary = os.environ.get('CHROME_BIN') or os.environ.get('CHROME_PATH')
     if chrome_binary and os.path.exists(chrome_binary):
         chrome_options.binary_location = chrome_binary
-        print(f"DEBUG - Using system Chrome: {chrome_binary}")
+        logger.debug("Using system Chrome: %s", chrome_binary)
     
     return chrome_options
 
-def scrape_airbnb_listings_selenium(search_url: str, max_listings: int = 3) -> List[Dict]:
-    """Scrape Airbnb search results using Selenium for JavaScript rendering"""
+def _install_cdp_blocks(driver):
+    """Have Chrome drop requests for images, fonts, media and trackers.
     
-    global _driver_cache
+    Current Chrome ignores --disable-images/--disable-css, so this is what actually stops those
+    downloads. Stylesheets still load: element.text only returns rendered, visible text.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URL_PATTERNS})
+        driver.execute_cdp_cmd("Network.setBypassServiceWorker", {"bypass": True})
+    except Exception as e:
+        logger.debug("Could not install request blocking: %s", e)
+
+def _create_driver():
+    """Start a headless Chrome set up for scraping"""
+    logger.debug("Setting up new Selenium driver...")
     
+    # Get optimized Chrome options
+    chrome_options = get_chrome_options()
+    
+    # Setup driver with proper service
     try:
-        # Reuse existing driver if available
-        if _driver_cache:
-            try:
-                # Test if driver is still alive
-                _driver_cache.current_url
-                driver = _driver_cache
-                print("DEBUG - Reusing existing Chrome driver")
-            except:
-                # Driver is dead, create new one
-                _driver_cache = None
+        # Try to use system ChromeDriver first (if available in Docker)
+        service = Service()
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception as e:
+        logger.debug("System ChromeDriver failed, using webdriver-manager: %s", e)
+        # Fallback to webdriver-manager
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    
+    # Remove automation indicators
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    _install_cdp_blocks(driver)
+    return driver
+
+def _quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+def _acquire_driver():
+    """Take a live driver from the pool, start one if under the limit, or wait for one to be returned"""
+    global _live_driver_count
+    deadline = time.monotonic() + _DRIVER_WAIT_TIMEOUT
+    while True:
+        with _driver_cond:
+            while not _idle_drivers and _live_driver_count >= _MAX_LIVE_DRIVERS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException("No Selenium driver became free")
+                _driver_cond.wait(remaining)
+            if _idle_drivers:
+                driver, _ = _idle_drivers.pop()
+            else:
                 driver = None
-        else:
-            driver = None
+                _live_driver_count += 1
         
-        # Create new driver if needed
-        if not driver:
-            print(f"DEBUG - Setting up new Selenium driver...")
-            
-            # Get optimized Chrome options
-            chrome_options = get_chrome_options()
-            
-            # Setup driver with proper service
+        if driver is None:
             try:
-                # Try to use system ChromeDriver first (if available in Docker)
-                service = Service()
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-            except Exception as e:
-                print(f"DEBUG - System ChromeDriver failed, using webdriver-manager: {e}")
-                # Fallback to webdriver-manager
-                service = Service(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            # Remove automation indicators
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # Cache the driver for reuse
-            _driver_cache = driver
+                return _create_driver()
+            except Exception:
+                _forget_driver()
+                raise
+        
+        try:
+            # Test if driver is still alive
+            driver.current_url
+            logger.debug("Reusing existing Chrome driver")
+            return driver
+        except Exception:
+            # Driver is dead, drop it and try again
+            _discard_driver(driver)
+
+def _release_driver(driver):
+    """Return a healthy driver to the pool, quitting it if the pool is already full"""
+    with _driver_cond:
+        if len(_idle_drivers) < _DRIVER_POOL_SIZE:
+            _idle_drivers.append((driver, time.monotonic()))
+            _driver_cond.notify()
+            _start_driver_reaper()
+            return
+    _discard_driver(driver)
+    logger.debug("Selenium driver closed")
+
+def _discard_driver(driver):
+    """Quit a driver that won't go back to the pool and free its slot"""
+    _quit_driver(driver)
+    _forget_driver()
+
+def _forget_driver():
+    global _live_driver_count
+    with _driver_cond:
+        _live_driver_count -= 1
+        _driver_cond.notify()
+
+def _start_driver_reaper():
+    """Start the background thread that quits idle drivers, once per process (call with _driver_cond held)"""
+    global _driver_reaper
+    if _driver_reaper is None:
+        _driver_reaper = threading.Thread(target=_reap_idle_drivers, name="selenium-driver-reaper", daemon=True)
+        _driver_reaper.start()
+
+def _reap_idle_drivers():
+    """Quit pooled drivers that have sat unused for the idle timeout"""
+    global _live_driver_count
+    while not _driver_reaper_stop.wait(max(1.0, _DRIVER_IDLE_TIMEOUT / 4)):
+        now = time.monotonic()
+        with _driver_cond:
+            expired = [driver for driver, idle_since in _idle_drivers if now - idle_since >= _DRIVER_IDLE_TIMEOUT]
+            if not expired:
+                continue
+            _idle_drivers[:] = [(driver, idle_since) for driver, idle_since in _idle_drivers if driver not in expired]
+            _live_driver_count -= len(expired)
+            _driver_cond.notify(len(expired))
+        for driver in expired:
+            _quit_driver(driver)
+            logger.debug("Idle Selenium driver closed")
+
+def scrape_airbnb_listings_selenium(search_url: str, max_listings: int = 3) -> List[Dict]:
+    """Scrape Airbnb search results using Selenium for JavaScript rendering"""
+    
+    driver = None
+    try:
+        driver = _acquire_driver()
         
-        print(f"DEBUG - Attempting to scrape with Selenium: {search_url}")
+        logger.debug("Attempting to scrape with Selenium: %s", search_url)
         driver.get(search_url)
         
         # Wait for page to load
-        print("DEBUG - Waiting for page to load...")
+        logger.debug("Waiting for page to load...")
         time.sleep(1)
         
         # Wait for listings to appear
@@ -135,234 +385,155 @@ def scrape_airbnb_listings_selenium(search_url: str, max_listings: int = 3) -> L
             WebDriverWait(driver, 5).until(  # Reduced from 10 to 5 seconds
                 EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='card-container'], [aria-label*='listing'], .atm_9s_1txwivl"))
             )
-            print("DEBUG - Listings found, proceeding to scrape...")
+            logger.debug("Listings found, proceeding to scrape...")
         except TimeoutException:
-            print("DEBUG - Timeout waiting for listings, proceeding anyway...")
+            logger.debug("Timeout waiting for listings, proceeding anyway...")
         
-        # Try multiple selectors for listing containers
-        selectors_to_try = [
-            "[data-testid='card-container']",  # Primary listing card container
-            "[role='group'][aria-label*='listing']",  # Listing groups
-            "[role='group'][aria-label*='property']",  # Property groups  
-            ".atm_9s_1txwivl[data-testid]",  # Elements with data-testid (more likely to be listings)
-            ".l1ovpqvx",  # Another common listing class
-            ".atm_gi_1n1ank9",  # Alternative listing container
-        ]
+        # All listing cards and their candidate fields in one round trip. Cards come back in document order
+        cards = driver.execute_script(
+            _COLLECT_LISTINGS_JS, _SELENIUM_LISTING_SELECTOR, _TITLE_XPATH, _PRICE_XPATH, _RATING_XPATH
+        ) or []
+        logger.debug("Listing selectors found %s elements", len(cards))
         
         listings = []
-        
-        for selector in selectors_to_try:
+        seen_links = set()
+        listing_count = 0
+        for i, card in enumerate(cards):
+            if listing_count >= max_listings:
+                break
+            
             try:
-                elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                print(f"DEBUG - Selector '{selector}' found {len(elements)} elements")
+                # Get element text to filter out non-listing elements
+                element_text = card['text'].strip()
+                
+                # Skip search interface elements
+                is_ui_element = _SKIP_RE.search(element_text) is not None
+                if is_ui_element or len(element_text) < 10:
+                    logger.debug("Skipping UI element: %s...", element_text[:100])
+                    continue
+                    
+                listing_data = {}
+                
+                logger.debug("Listing Element %s text: %s...", listing_count+1, element_text[:200])
                 
-                if elements:
-                    listing_count = 0
-                    for i, element in enumerate(elements):
-                        if listing_count >= max_listings:
+                # Extract link
+                href = card['href']
+                if href:
+                    if href.startswith('/'):
+                        link = f"https://www.airbnb.com{href}"
+                    else:
+                        link = href
+                else:
+                    link = search_url
+                
+                # Nested containers (a listing group around its card) both match the combined selector
+                if link != search_url:
+                    if link in seen_links:
+                        continue
+                    seen_links.add(link)
+                
+                # Extract title - look for property names
+                try:
+                    title = None
+                    for title_text in card['titles']:
+                        title_text = title_text.strip()
+                        # Make sure it's actually a property title, not UI text
+                        if title_text and not _SKIP_RE.search(title_text):
+                            title = title_text
                             break
-                            
-                        try:
-                            # Get element text to filter out non-listing elements
-                            element_text = element.text.strip()
-                            
-                            # Skip search interface elements
-                            skip_phrases = [
-                                "Start your search", "Check in", "Check out", "Guests", 
-                                "Filters", "filters applied", "Become a host", "Location",
-                                "Homes in", "Total before taxes", "Display total before taxes"
-                            ]
-                            
-                            is_ui_element = any(phrase in element_text for phrase in skip_phrases)
-                            if is_ui_element or len(element_text) < 10:
-                                print(f"DEBUG - Skipping UI element: {element_text[:100]}...")
-                                continue
-                                
-                            listing_data = {}
-                            
-                            # First, let's see the element HTML for debugging (only for actual listings)
-                            element_html = element.get_attribute('outerHTML')[:500]  # First 500 chars
-                            print(f"DEBUG - Listing Element {listing_count+1} HTML: {element_html}")
-                            print(f"DEBUG - Listing Element {listing_count+1} text: {element_text[:200]}...")
-                            
-                            # Extract title - look for property names
-                            try:
-                                title_selectors = [
-                                    "[data-testid='listing-card-title']",
-                                    ".atm_7l_jt7fhx",
-                                    "h3",
-                                    ".t1jojoys",
-                                    "[role='heading']"
-                                ]
-                                title = None
-                                for title_sel in title_selectors:
-                                    try:
-                                        title_elem = element.find_element(By.CSS_SELECTOR, title_sel)
-                                        title_text = title_elem.text.strip()
-                                        # Make sure it's actually a property title, not UI text
-                                        if title_text and not any(phrase in title_text for phrase in skip_phrases):
-                                            title = title_text
-                                            break
-                                    except NoSuchElementException:
-                                        continue
-                                
-                                # If no title found, extract from element text (look for property-like text)
-                                if not title:
-                                    lines = element_text.split('\n')
-                                    for line in lines[:3]:  # Check first few lines
-                                        line = line.strip()
-                                        if (len(line) > 5 and len(line) < 100 and 
-                                            not any(phrase in line for phrase in skip_phrases) and
-                                            not line.startswith('$') and not line.startswith('★')):
-                                            title = line
-                                            break
-                                
-                                listing_data['title'] = title or f"Property Listing {listing_count+1}"
-                            except Exception as e:
-                                listing_data['title'] = f"Property Listing {listing_count+1}"
-                                print(f"DEBUG - Title extraction error: {e}")
-                            
-                            # Extract price - improved with element text search
-                            try:
-                                price_selectors = [
-                                    "[data-testid='price-availability']",
-                                    ".atm_7h_hxbz6r",
-                                    ".a8jt5op", 
-                                    "[aria-label*='price']",
-                                    "span[aria-hidden='true']",  # Common for price text
-                                    "span",  # Try all spans
-                                    "div"    # Try all divs
-                                ]
-                                price = None
-                                
-                                # Try specific selectors first
-                                for price_sel in price_selectors:
-                                    try:
-                                        price_elems = element.find_elements(By.CSS_SELECTOR, price_sel)
-                                        for price_elem in price_elems:
-                                            price_text = price_elem.text.strip()
-                                            if '$' in price_text or '€' in price_text or '₽' in price_text:
-                                                price = price_text
-                                                print(f"DEBUG - Found price with selector '{price_sel}': {price}")
-                                                break
-                                        if price:
-                                            break
-                                    except NoSuchElementException:
-                                        continue
-                                
-                                # If no specific selector worked, search in entire element text
-                                if not price:
-                                    # Look for price patterns in the entire element text
-                                    price_patterns = [
-                                        r'\$\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
-                                        r'€\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
-                                        r'₽\d+[,.]?\d*(?:\s*per\s*night|\s*/\s*night|\s*night)?',
-                                        r'\$\d+',  # Simple dollar amount
-                                        r'€\d+',   # Simple euro amount
-                                        r'₽\d+'    # Simple ruble amount
-                                    ]
-                                    for pattern in price_patterns:
-                                        match = re.search(pattern, element_text, re.IGNORECASE)
-                                        if match:
-                                            price = match.group(0)
-                                            print(f"DEBUG - Found price with regex '{pattern}': {price}")
-                                            break
-                                
-                                listing_data['price'] = price or "Price available on site"
-                            except Exception as e:
-                                listing_data['price'] = "Price available on site"
-                                print(f"DEBUG - Price extraction error: {e}")
-                            
-                            # Extract rating - improved with element text search
-                            try:
-                                rating_selectors = [
-                                    "[data-testid='listing-card-subtitle']",
-                                    ".r1dxllyb",
-                                    ".atm_3f_glywfm",
-                                    "[aria-label*='rating']",
-                                    "[aria-label*='star']",
-                                    "span",  # Try all spans
-                                    "div"    # Try all divs
-                                ]
-                                rating = None
-                                
-                                # Try specific selectors first
-                                for rating_sel in rating_selectors:
-                                    try:
-                                        rating_elems = element.find_elements(By.CSS_SELECTOR, rating_sel)
-                                        for rating_elem in rating_elems:
-                                            rating_text = rating_elem.text.strip()
-                                            # Look for star rating pattern
-                                            if any(char.isdigit() for char in rating_text) and ('★' in rating_text or '⭐' in rating_text or 'star' in rating_text.lower() or re.search(r'\d+\.\d+', rating_text)):
-                                                rating = rating_text
-                                                print(f"DEBUG - Found rating with selector '{rating_sel}': {rating}")
-                                                break
-                                        if rating:
-                                            break
-                                    except NoSuchElementException:
-                                        continue
-                                
-                                # If no specific selector worked, search in entire element text
-                                if not rating:
-                                    # Look for rating patterns in the entire element text
-                                    rating_patterns = [
-                                        r'\d+\.\d+\s*(?:★|⭐|stars?)',
-                                        r'★\s*\d+\.\d+',
-                                        r'⭐\s*\d+\.\d+',
-                                        r'\d+\.\d+\s*\(\d+\)',  # 4.5 (123) format
-                                        r'\d+\.\d+\s*•\s*\d+\s*reviews?',  # 4.5 • 123 reviews format
-                                        r'\d+\.\d+'  # Simple decimal rating
-                                    ]
-                                    for pattern in rating_patterns:
-                                        match = re.search(pattern, element_text, re.IGNORECASE)
-                                        if match:
-                                            rating = match.group(0)
-                                            print(f"DEBUG - Found rating with regex '{pattern}': {rating}")
-                                            break
-                                
-                                listing_data['rating'] = rating or "Rating not available"
-                            except Exception as e:
-                                listing_data['rating'] = "Rating not available"
-                                print(f"DEBUG - Rating extraction error: {e}")
-                            
-                            # Extract link
-                            try:
-                                link_elem = element.find_element(By.CSS_SELECTOR, "a")
-                                href = link_elem.get_attribute("href")
-                                if href:
-                                    if href.startswith('/'):
-                                        listing_data['link'] = f"https://www.airbnb.com{href}"
-                                    else:
-                                        listing_data['link'] = href
-                                else:
-                                    listing_data['link'] = search_url
-                            except:
-                                listing_data['link'] = search_url
-                            
-                            listing_data['source'] = 'airbnb_selenium'
-                            
-                            print(f"DEBUG - Scraped listing {listing_count+1}: {listing_data['title'][:50]}... | {listing_data['price']} | {listing_data['rating']}")
-                            listings.append(listing_data)
-                            listing_count += 1  # Increment only for valid listings
-                            
-                        except Exception as e:
-                            print(f"DEBUG - Error processing element {i+1}: {e}")
-                            continue
                     
-                    if listings:
-                        print(f"DEBUG - Successfully scraped {len(listings)} real listings with selector '{selector}'")
-                        break
-                        
+                    # If no title found, extract from element text (look for property-like text)
+                    if not title:
+                        lines = element_text.split('\n')
+                        for line in lines[:3]:  # Check first few lines
+                            line = line.strip()
+                            if (len(line) > 5 and len(line) < 100 and 
+                                not _SKIP_RE.search(line) and
+                                not line.startswith('$') and not line.startswith('★')):
+                                title = line
+                                break
+                    
+                    listing_data['title'] = title or f"Property Listing {listing_count+1}"
+                except Exception as e:
+                    listing_data['title'] = f"Property Listing {listing_count+1}"
+                    logger.warning("Title extraction error: %s", e)
+                
+                # Extract price - improved with element text search
+                try:
+                    price = None
+                    
+                    # Try specific selectors first
+                    for price_text in card['prices']:
+                        price_text = price_text.strip()
+                        if '$' in price_text or '€' in price_text or '₽' in price_text:
+                            price = price_text
+                            logger.debug("Found price with selector: %s", price)
+                            break
+                    
+                    # If no specific selector worked, search in entire element text
+                    if not price:
+                        # Look for price patterns in the entire element text
+                        for pattern in _PRICE_PATTERNS:
+                            match = pattern.search(element_text)
+                            if match:
+                                price = match.group(0)
+                                logger.debug("Found price with regex '%s': %s", pattern.pattern, price)
+                                break
+                    
+                    listing_data['price'] = price or "Price available on site"
+                except Exception as e:
+                    listing_data['price'] = "Price available on site"
+                    logger.warning("Price extraction error: %s", e)
+                
+                # Extract rating - improved with element text search
+                try:
+                    rating = None
+                    
+                    # Try specific selectors first
+                    for rating_text in card['ratings']:
+                        rating_text = rating_text.strip()
+                        # Look for star rating pattern
+                        if any(char.isdigit() for char in rating_text) and ('★' in rating_text or '⭐' in rating_text or 'star' in rating_text.lower() or _RATING_TEXT_RE.search(rating_text)):
+                            rating = rating_text
+                            logger.debug("Found rating with selector: %s", rating)
+                            break
+                    
+                    # If no specific selector worked, search in entire element text
+                    if not rating:
+                        # Look for rating patterns in the entire element text
+                        for pattern in _RATING_PATTERNS:
+                            match = pattern.search(element_text)
+                            if match:
+                                rating = match.group(0)
+                                logger.debug("Found rating with regex '%s': %s", pattern.pattern, rating)
+                                break
+                    
+                    listing_data['rating'] = rating or "Rating not available"
+                except Exception as e:
+                    listing_data['rating'] = "Rating not available"
+                    logger.warning("Rating extraction error: %s", e)
+                
+                listing_data['link'] = link
+                listing_data['source'] = 'airbnb_selenium'
+                
+                logger.debug("Scraped listing %s: %s... | %s | %s", listing_count+1, listing_data['title'][:50], listing_data['price'], listing_data['rating'])
+                listings.append(listing_data)
+                listing_count += 1  # Increment only for valid listings
+                
             except Exception as e:
-                print(f"DEBUG - Error with selector '{selector}': {e}")
+                logger.debug("Error processing element %s: %s", i+1, e)
                 continue
         
+        if listings:
+            logger.debug("Successfully scraped %s real listings", len(listings))
+        
         if not listings:
-            print("DEBUG - No listings found with Selenium, checking page content...")
-            page_source = driver.page_source
-            print(f"DEBUG - Page title: {driver.title}")
-            print(f"DEBUG - Page source length: {len(page_source)}")
-            print(f"DEBUG - First 1000 chars: {page_source[:1000]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No listings found with Selenium, checking page content...")
+                page_source = driver.page_source
+                logger.debug("Page title: %s", driver.title)
+                logger.debug("Page source length: %s", len(page_source))
+                logger.debug("First 1000 chars: %s", page_source[:1000])
             
             # Return redirect message instead of fake data
             listings = [
@@ -378,7 +549,11 @@ def scrape_airbnb_listings_selenium(search_url: str, max_listings: int = 3) -> L
         return listings[:max_listings]
         
     except Exception as e:
-        print(f"DEBUG - Selenium scraping error: {e}")
+        logger.warning("Selenium scraping error: %s", e)
+        # The browser may be wedged mid-navigation - don't hand it to the next search
+        if driver:
+            _discard_driver(driver)
+            driver = None
         return [
             {
                 'title': f'Properties available on Airbnb',
@@ -391,41 +566,41 @@ def scrape_airbnb_listings_selenium(search_url: str, max_listings: int = 3) -> L
     
     finally:
         if driver:
-            driver.quit()
-            print("DEBUG - Selenium driver closed")
+            _release_driver(driver)
 
 def scrape_airbnb_listings_requests(search_url: str, max_listings: int = 3) -> List[Dict]:
-    """Fallback scraping method using requests and BeautifulSoup"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-    }
-    
+    """Fast scraping method using a plain HTTP/2 fetch and BeautifulSoup"""
     try:
-        print(f"DEBUG - Attempting to scrape: {search_url}")
-        response = requests.get(search_url, headers=headers, timeout=5)  # Reduced from 10 to 5 seconds
-        print(f"DEBUG - Response status code: {response.status_code}")
-        response.raise_for_status()
+        logger.debug("Attempting to scrape: %s", search_url)
+        # Stream the body and stop at _MAX_PAGE_BYTES - listing cards come early in the markup,
+        # the rest of the page is mostly inline script data we never look at
+        with _http_client.stream("GET", search_url) as response:
+            logger.debug("Response status code: %s", response.status_code)
+            response.raise_for_status()
+            
+            chunks = []
+            received = 0
+            for chunk in response.iter_bytes(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= _MAX_PAGE_BYTES:
+                    logger.debug("Stopped reading page after %s bytes", received)
+                    break
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(b''.join(chunks), 'lxml')  # C parser; lxml is already a dependency
         listings = []
         
-        # Look for listing containers (Airbnb structure changes frequently)
-        potential_selectors = [
-            '[data-testid="listing-card-title"]',
-            '[data-testid="card-container"]',
-            '.c4mnd7m',  # Common Airbnb class
-            '[aria-label*="listing"]'
-        ]
+        # Look for listing containers in one pass over the document
+        matches = [[] for _ in _LISTING_SELECTORS]
+        for element in _ANY_LISTING_SELECTOR.select(soup):
+            for bucket, pattern in zip(matches, _LISTING_SELECTOR_PATTERNS):
+                if pattern.match(element):
+                    bucket.append(element)
         
-        print(f"DEBUG - Trying {len(potential_selectors)} different selectors...")
+        logger.debug("Trying %s different selectors...", len(_LISTING_SELECTORS))
         
-        for i, selector in enumerate(potential_selectors):
-            elements = soup.select(selector)
-            print(f"DEBUG - Selector {i+1} '{selector}' found {len(elements)} elements")
+        for i, (selector, elements) in enumerate(zip(_LISTING_SELECTORS, matches)):
+            logger.debug("Selector %s '%s' found %s elements", i+1, selector, len(elements))
             if elements:
                 for j, element in enumerate(elements[:max_listings]):
                     try:
@@ -433,9 +608,14 @@ def scrape_airbnb_listings_requests(search_url: str, max_listings: int = 3) -> L
                         title_elem = element.find('div', {'data-testid': 'listing-card-title'}) or element
                         title = title_elem.get_text(strip=True) if title_elem else f"Listing {j+1}"
                         
+                        # Price and rating live in the listing's card - a title element is nested inside
+                        # it, the other selectors match the card itself. Scanning the card's text once keeps
+                        # the lookup bounded instead of walking the rest of the document for every listing
+                        card = element.find_parent(attrs={'data-testid': 'card-container'}) or element
+                        card_strings = list(card.stripped_strings)
+                        
                         # Try to find price
-                        price_elem = element.find_next(string=re.compile(r'\$\d+'))
-                        price = price_elem.strip() if price_elem else "Price available on site"
+                        price = next((s for s in card_strings if _PRICE_TEXT_RE.search(s)), None)
                         
                         # Try to find link
                         link_elem = element.find_parent('a') or element.find('a')
@@ -448,10 +628,20 @@ def scrape_airbnb_listings_requests(search_url: str, max_listings: int = 3) -> L
                                 link = href
                         
                         # Try to find rating
-                        rating_elem = element.find(string=re.compile(r'\d+\.\d+')) or element.find_next(string=re.compile(r'\d+\.\d+'))
-                        rating = rating_elem.strip() if rating_elem else "Rating not available"
+                        rating = next((s for s in card_strings if _RATING_TEXT_RE.search(s)), None)
+                        
+                        # No card container (e.g. a bare title element): look a bounded number of strings
+                        # past the element, where the old find_next lookup found them
+                        if card is element and (price is None or rating is None):
+                            following = [s.strip() for s in element.find_all_next(string=True, limit=_NEXT_STRINGS_LIMIT)]
+                            if price is None:
+                                price = next((s for s in following if _PRICE_TEXT_RE.search(s)), None)
+                            if rating is None:
+                                rating = next((s for s in following if _RATING_TEXT_RE.search(s)), None)
+                        price = price or "Price available on site"
+                        rating = rating or "Rating not available"
                         
-                        print(f"DEBUG - Found listing {j+1}: title='{title}', price='{price}', rating='{rating}'")
+                        logger.debug("Found listing %s: title='%s', price='%s', rating='%s'", j+1, title, price, rating)
                         
                         listings.append({
                             'title': title,
@@ -461,59 +651,76 @@ def scrape_airbnb_listings_requests(search_url: str, max_listings: int = 3) -> L
                             'source': 'airbnb_requests'
                         })
                     except Exception as e:
-                        print(f"DEBUG - Error extracting listing {j+1}: {e}")
+                        logger.debug("Error extracting listing %s: %s", j+1, e)
                         continue
                 
                 if listings:
-                    print(f"DEBUG - Successfully scraped {len(listings)} listings with selector '{selector}'")
+                    logger.debug("Successfully scraped %s listings with selector '%s'", len(listings), selector)
                     break
         
         return listings[:max_listings]
         
     except Exception as e:
-        print(f"DEBUG - Requests scraping error: {e}")
+        logger.warning("Requests scraping error: %s", e)
         return []
 
 def scrape_airbnb_listings(search_url: str, max_listings: int = 3) -> List[Dict]:
-    """Main scraping function that tries requests first (faster), then falls back to Selenium"""
-    print(f"DEBUG - Starting scraping process for: {search_url}")
+    """Main scraping function that serves recent results from cache, then tries requests, then Selenium"""
+    logger.debug("Starting scraping process for: %s", search_url)
+    
+    cache_key = (_canonical_search_url(search_url), max_listings)
+    with _scrape_cache_lock:
+        cached = _scrape_cache.get(cache_key)
+    if cached is not None:
+        logger.debug("Returning cached scraping results")
+        return [dict(result) for result in cached]
     
+    results = _scrape_airbnb_listings_uncached(search_url, max_listings)
+    
+    # Redirect placeholders mean scraping failed - don't pin those for the whole TTL
+    if not any(result.get('source') == 'airbnb_redirect' for result in results):
+        with _scrape_cache_lock:
+            _scrape_cache[cache_key] = [dict(result) for result in results]
+    return results
+
+def _scrape_airbnb_listings_uncached(search_url: str, max_listings: int) -> List[Dict]:
+    """Try requests first (faster), then fall back to Selenium"""
     import time
     start_time = time.time()
     max_total_time = 15  # Maximum 15 seconds total
     
     # Try requests first (much faster - 1-2 seconds vs 5-10 seconds)
-    print("DEBUG - Trying fast requests method first...")
+    logger.debug("Trying fast requests method first...")
     try:
         results = scrape_airbnb_listings_requests(search_url, max_listings)
         if results and len(results) > 0:
-            print("DEBUG - Requests scraping successful!")
+            logger.debug("Requests scraping successful!")
             return results
     except Exception as e:
-        print(f"DEBUG - Requests failed: {e}")
+        logger.warning("Requests failed: %s", e)
     
     # Check if we still have time for Selenium
     elapsed_time = time.time() - start_time
     if elapsed_time > max_total_time:
-        print(f"DEBUG - Time limit exceeded ({elapsed_time:.1f}s), skipping Selenium")
+        logger.debug("Time limit exceeded (%.1fs), skipping Selenium", elapsed_time)
         return generate_fallback_results(search_url)
     
     # Fallback to Selenium only if requests failed and we have time
-    print("DEBUG - Falling back to Selenium method...")
+    logger.debug("Falling back to Selenium method...")
     try:
         results = scrape_airbnb_listings_selenium(search_url, max_listings)
         if results and any('selenium' in result.get('source', '') for result in results):
-            print("DEBUG - Selenium scraping successful!")
+            logger.debug("Selenium scraping successful!")
             return results
     except Exception as e:
-        print(f"DEBUG - Selenium failed: {e}")
+        logger.warning("Selenium failed: %s", e)
     
     # Final fallback
     return generate_fallback_results(search_url)
 
 def generate_fallback_results(search_url: str) -> List[Dict]:
     """Generate fallback results when scraping fails"""
-    print("DEBUG - All scraping methods failed, returning redirect message")
+    logger.warning("All scraping methods failed, returning redirect message")
     location = "your location"
     if "/s/" in search_url:
         try:
@@ -1,14 +1,86 @@
 import urllib.parse
-from datetime import datetime, timedelta
+import logging
+from datetime import date, timedelta
+from functools import lru_cache
 from models import SearchParams, AIRBNB_AMENITIES, AIRBNB_PROPERTY_TYPES, AIRBNB_ROOM_TYPES
 
+logger = logging.getLogger(__name__)
+
+# Popular amenities added to every search to improve results
+_DEFAULT_AMENITIES = ('wifi', 'kitchen')
+
+# Query fragments that never change between searches, already percent-encoded in Airbnb's format
+_ROOM_TYPE_PARAM = "room_types%5B%5D=Entire%20home%2Fapt"
+_AMENITY_PARAMS = {
+    amenity: f"amenities%5B{amenity_id}%5D={amenity_id}" for amenity, amenity_id in AIRBNB_AMENITIES.items()
+}
+_DEFAULT_AMENITY_PARAMS = [_AMENITY_PARAMS[amenity] for amenity in _DEFAULT_AMENITIES]
+
+# Static system prompt for the chat reply. It is sent byte-for-byte identical as the first message
+# of every request so provider-side prompt-prefix caching can reuse it; per-turn context goes in
+# a separate system message after it
+PERSONA_PROMPT = """You are Alex, a helpful AI travel assistant for Confind. Be friendly but CONCISE and DIRECT.
+
+Your job:
+1. Extract travel details (location, guests, budget, dates) from conversation
+2. Confirm extracted details with user briefly
+3. Search for properties when confirmed
+4. Present actual search results professionally
+
+CRITICAL RULES:
+- NEVER create or mention fake property names, prices, or ratings
+- NEVER mention "system", "search results", or technical internals
+- ONLY present properties that are provided in actual search results
+- If no search results provided, ask user to provide missing info
+
+CONFIRMATION FLOW:
+1. Extract: location, dates, guests, budget from user message
+2. Confirm: "I'll search for [location] from [dates] for [guests] people under $[budget]. Ready?"
+3. Search: Only after user confirms with "yes", "go", "correct", etc.
+4. Results: Present actual properties from search results, never fake ones
+
+WHEN SEARCH RESULTS ARE PROVIDED:
+- Present each actual property with real data
+- Never make up property names or details
+- If no results provided, politely ask for clarification
+
+Keep responses short and professional. No system mentions."""
+
+# (day computed for, check-in, check-out) - the strings only change at midnight
+_default_dates = (None, "", "")
+
+def get_default_dates() -> tuple:
+    """Default stay when no dates were given: next week for 3 nights"""
+    global _default_dates
+    today = date.today()
+    if _default_dates[0] != today:
+        _default_dates = (
+            today,
+            (today + timedelta(days=7)).isoformat(),
+            (today + timedelta(days=10)).isoformat(),
+        )
+    return _default_dates[1], _default_dates[2]
+
 def build_airbnb_url(params: SearchParams) -> str:
     """Build Airbnb search URL with proper query parameters"""
-    if not params.location:
+    # Follow-up turns usually resolve to the same parameters, so URLs are memoized on
+    # their values; the default dates are part of the key so cached URLs roll over daily
+    has_dates = bool(params.checkin and params.checkout)
+    return _build_airbnb_url(
+        params.location, params.guests,
+        params.checkin if has_dates else None, params.checkout if has_dates else None,
+        params.min_price, params.max_price, params.property_type,
+        tuple(params.amenities) if params.amenities else None,
+        None if has_dates else get_default_dates(),
+    )
+
+@lru_cache(maxsize=1024)
+def _build_airbnb_url(location, guests, checkin, checkout, min_price, max_price, property_type, amenities, default_dates) -> str:
+    if not location:
         return "https://www.airbnb.com/s/homes"
     
     # Clean location for URL
-    location_clean = urllib.parse.quote_plus(params.location)
+    location_clean = urllib.parse.quote_plus(location)
     base_url = f"https://www.airbnb.com/s/{location_clean}/homes"
     
     query_params = []
@@ -17,59 +89,57 @@ def build_airbnb_url(params: SearchParams) -> str:
     query_params.append("currency=USD")
     
     # Add guests
-    if params.guests:
-        query_params.append(f"adults={params.guests}")
+    if guests:
+        query_params.append(f"adults={guests}")
     
     # Add dates (use proper format)
-    if params.checkin and params.checkout:
+    if checkin and checkout:
         query_params.extend([
-            f"checkin={params.checkin}",
-            f"checkout={params.checkout}"
+            f"checkin={checkin}",
+            f"checkout={checkout}"
         ])
     else:
         # Add default dates (next week for 3 nights)
-        checkin_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        checkout_date = (datetime.now() + timedelta(days=10)).strftime("%Y-%m-%d")
+        checkin_date, checkout_date = default_dates
         query_params.extend([
             f"checkin={checkin_date}",
             f"checkout={checkout_date}"
         ])
     
     # Add price range (now in USD)
-    if params.min_price:
-        query_params.append(f"price_min={params.min_price}")
-    if params.max_price:
-        query_params.append(f"price_max={params.max_price}")
+    if min_price:
+        query_params.append(f"price_min={min_price}")
+    if max_price:
+        query_params.append(f"price_max={max_price}")
     
-    print(f"DEBUG - Price params: min={params.min_price}, max={params.max_price}")
-    print(f"DEBUG - URL will have: {[p for p in query_params if 'price' in p]}")
+    logger.debug("Price params: min=%s, max=%s", min_price, max_price)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("URL will have: %s", [p for p in query_params if 'price' in p])
     
     # Add property type using proper Airbnb format
-    if params.property_type and params.property_type.lower() in AIRBNB_PROPERTY_TYPES:
-        property_id = AIRBNB_PROPERTY_TYPES[params.property_type.lower()]
+    if property_type and property_type.lower() in AIRBNB_PROPERTY_TYPES:
+        property_id = AIRBNB_PROPERTY_TYPES[property_type.lower()]
         query_params.append(f"property_type_id%5B0%5D={property_id}")
     
     # Add room type (default to entire home)
-    query_params.append("room_types%5B%5D=Entire%20home%2Fapt")
-    
-    # Add popular amenities if mentioned
-    if params.amenities:
-        for amenity in params.amenities:
-            if amenity.lower() in AIRBNB_AMENITIES:
-                amenity_id = AIRBNB_AMENITIES[amenity.lower()]
-                query_params.append(f"amenities%5B{amenity_id}%5D={amenity_id}")
-    
-    # Add some default popular amenities to improve results
-    default_amenities = ['wifi', 'kitchen']
-    for amenity in default_amenities:
-        if not params.amenities or amenity not in [a.lower() for a in params.amenities]:
-            amenity_id = AIRBNB_AMENITIES[amenity]
-            query_params.append(f"amenities%5B{amenity_id}%5D={amenity_id}")
-    
-    if query_params:
-        return f"{base_url}?{'&'.join(query_params)}"
-    
-    return base_url
+    query_params.append(_ROOM_TYPE_PARAM)
+    
+    if not amenities:
+        # Nothing requested: the default amenities are a fixed suffix
+        query_params.extend(_DEFAULT_AMENITY_PARAMS)
+    else:
+        # Add popular amenities if mentioned
+        requested_amenities = [a.lower() for a in amenities]
+        for amenity in requested_amenities:
+            if amenity in _AMENITY_PARAMS:
+                query_params.append(_AMENITY_PARAMS[amenity])
+        
+        # Add some default popular amenities to improve results
+        for amenity in _DEFAULT_AMENITIES:
+            if amenity not in requested_amenities:
+                query_params.append(_AMENITY_PARAMS[amenity])
+    
+    return f"{base_url}?{'&'.join(query_params)}"
 
 def format_search_confirmation(params: SearchParams) -> str:
     """Format extracted parameters into a short confirmation message"""
@@ -93,35 +163,4 @@ def format_search_confirmation(params: SearchParams) -> str:
     
     # Create short confirmation
     summary = " • ".join(parts)
-    return f"Searching for: {summary}\n\nSound good?"
-
-def get_persona_prompt(search_context: str = "") -> str:
-    """Get the concise persona prompt with optional search context"""
-    base_prompt = """You are Alex, a helpful AI travel assistant for Confind. Be friendly but CONCISE and DIRECT.
-
-Your job:
-1. Extract travel details (location, guests, budget, dates) from conversation
-2. Confirm extracted details with user briefly
-3. Search for properties when confirmed
-4. Present actual search results professionally
-
-CRITICAL RULES:
-- NEVER create or mention fake property names, prices, or ratings
-- NEVER mention "system", "search results", or technical internals
-- ONLY present properties that are provided in actual search results
-- If no search results provided, ask user to provide missing info
-
-CONFIRMATION FLOW:
-1. Extract: location, dates, guests, budget from user message
-2. Confirm: "I'll search for [location] from [dates] for [guests] people under $[budget]. Ready?"
-3. Search: Only after user confirms with "yes", "go", "correct", etc.
-4. Results: Present actual properties from search results, never fake ones
-
-WHEN SEARCH RESULTS ARE PROVIDED:
-- Present each actual property with real data
-- Never make up property names or details
-- If no results provided, politely ask for clarification
-
-Keep responses short and professional. No system mentions."""
-    
-    return base_prompt + search_context 
\ No newline at end of file
+    return f"Searching for: {summary}\n\nSound good?"
\ No newline at end of file
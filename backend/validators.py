@@ -1,23 +1,72 @@
 import re
+import logging
 from models import SearchParams
 
+logger = logging.getLogger(__name__)
+
+# Stricter guest patterns used to recover from guest counts that were really prices
+_GUEST_FIX_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"(\d+)\s+(?:people|guests?|person|adults?)",
+    r"(?:for|with)\s+(\d+)(?:\s+(?:people|guests|adults))",
+    r"(\d+)\s+of us",
+)]
+
+# Price patterns used to fix missing or implausible budgets, tried in order
+_PRICE_FIX_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r"under\s+\$?(\d+)",  # "under $150" - should set max only
+    r"below\s+\$?(\d+)",  # "below $150" - should set max only
+    r"(\d+)\$?\s*(?:per\s*night\s*)?maximum.*?(\d+)\$?\s*area",  # "200$ maximum...150$ area"
+    r"around\s+\$?(\d+)",  # "around $150"
+    r"(\d+)\s*(?:to|through|-)\s*(\d+)\s*(?:dollars?|\$|per\s*night)",
+    r"budget.*?\$?(\d+)",
+    r"max.*?\$?(\d+)",
+    r"up\s+to\s+\$?(\d+)",  # "up to $150"
+)]
+
+# Trigger vocabularies; messages are lowercased before matching, so everything here is lowercase
+
+# Replies that confirm a pending search on their own
+_AFFIRMATIVE_RESPONSES = frozenset({
+    "yes", "yep", "yeah", "ok", "okay", "sure", "go", "go ahead",
+    "do it", "correct", "that's right", "search", "find", "start",
+    "perfect", "exactly", "sounds good", "looks good", "confirmed"
+})
+
+# Phrases asking to search right away (substring matches, one scan)
+_URGENT_SEARCH_RE = re.compile(
+    "|".join(map(re.escape, (
+        "search now", "find now", "go ahead and search", "search please",
+        "just search", "start search", "run search", "do search"
+    )))
+)
+
+# Last words that mean "go ahead"
+_TRIGGER_LAST_WORDS = frozenset({"go", "search", "find", "now", "please"})
+
+# Small refinements that are worth an immediate re-search (substring matches)
+_SIMPLE_ADDITION_RE = re.compile(
+    "center|downtown|cheap|expensive|budget|close|near|apartment|house|studio"
+)
+
+# Assistant phrasing that means a confirmation was already shown
+_CONFIRMATION_INDICATOR_RE = re.compile(
+    "|".join(map(re.escape, (
+        "ready?", "correct?", "sound good?", "i'll search", "should i search",
+        "would you like me to search", "confirm", "confirmation"
+    )))
+)
+
 def validate_and_fix_params(params: SearchParams, conversation_text: str) -> SearchParams:
     """Validate and fix extracted parameters before using them"""
-    print(f"DEBUG - Validating parameters: {params}")
+    logger.debug("Validating parameters: %s", params)
     
     # Fix guest count (should be 1-16, not prices)
     if params.guests and params.guests > 16:
-        print(f"DEBUG - Invalid guest count {params.guests}, fixing...")
+        logger.debug("Invalid guest count %s, fixing...", params.guests)
         # Look for more reasonable guest patterns
-        guest_patterns = [
-            r"(\d+)\s+(?:people|guests?|person|adults?)",
-            r"(?:for|with)\s+(\d+)(?:\s+(?:people|guests|adults))",
-            r"(\d+)\s+of us"
-        ]
-        
         new_guests = None
-        for pattern in guest_patterns:
-            matches = re.finditer(pattern, conversation_text, re.IGNORECASE)
+        for pattern in _GUEST_FIX_PATTERNS:
+            matches = pattern.finditer(conversation_text)
             for match in matches:
                 guest_num = int(match.group(1))
                 if 1 <= guest_num <= 16:  # Reasonable guest count
@@ -27,22 +76,11 @@ def validate_and_fix_params(params: SearchParams, conversation_text: str) -> Sea
                 break
         
         params.guests = new_guests or 2  # Default to 2 guests
-        print(f"DEBUG - Fixed guest count to: {params.guests}")
+        logger.debug("Fixed guest count to: %s", params.guests)
     
     # Fix price range (look for $150-200 pattern that was missed)
     if conversation_text:
         # Look for explicit price ranges mentioned, but only if extraction failed
-        price_fix_patterns = [
-            r"under\s+\$?(\d+)",  # "under $150" - should set max only
-            r"below\s+\$?(\d+)",  # "below $150" - should set max only
-            r"(\d+)\$?\s*(?:per\s*night\s*)?maximum.*?(\d+)\$?\s*area",  # "200$ maximum...150$ area"
-            r"around\s+\$?(\d+)",  # "around $150"
-            r"(\d+)\s*(?:to|through|-)\s*(\d+)\s*(?:dollars?|\$|per\s*night)",
-            r"budget.*?\$?(\d+)",
-            r"max.*?\$?(\d+)",
-            r"up\s+to\s+\$?(\d+)"  # "up to $150"
-        ]
-        
         # Only try to fix if current extraction seems wrong or incomplete
         should_fix_price = (
             (params.max_price and params.max_price > 500) or  # Extracted price too high
@@ -51,8 +89,8 @@ def validate_and_fix_params(params: SearchParams, conversation_text: str) -> Sea
         )
         
         if should_fix_price:
-            for pattern in price_fix_patterns:
-                match = re.search(pattern, conversation_text, re.IGNORECASE)
+            for pattern in _PRICE_FIX_PATTERNS:
+                match = pattern.search(conversation_text)
                 if match:
                     # Check if this is an "under/below/max/up to" pattern
                     pattern_text = match.group(0).lower()
@@ -63,7 +101,7 @@ def validate_and_fix_params(params: SearchParams, conversation_text: str) -> Sea
                         if 20 <= num1 <= 1000 and 20 <= num2 <= 1000:  # Reasonable prices
                             params.min_price = min(num1, num2) - 50  # Buffer
                             params.max_price = max(num1, num2)
-                            print(f"DEBUG - Fixed price range to: ${params.min_price}-${params.max_price}")
+                            logger.debug("Fixed price range to: $%s-$%s", params.min_price, params.max_price)
                             break
                     else:  # Single number
                         price = int(match.group(1))
@@ -71,11 +109,11 @@ def validate_and_fix_params(params: SearchParams, conversation_text: str) -> Sea
                             if is_max_constraint:
                                 params.max_price = price
                                 params.min_price = max(20, price - 100)  # Set reasonable minimum
-                                print(f"DEBUG - Fixed max price constraint to: ${params.min_price}-${params.max_price}")
+                                logger.debug("Fixed max price constraint to: $%s-$%s", params.min_price, params.max_price)
                             else:  # Around this price
                                 params.max_price = price + 50
                                 params.min_price = max(20, price - 50)
-                                print(f"DEBUG - Fixed price range around ${price} to: ${params.min_price}-${params.max_price}")
+                                logger.debug("Fixed price range around $%s to: $%s-$%s", price, params.min_price, params.max_price)
                             break
     
     # Ensure reasonable defaults
@@ -90,7 +128,7 @@ def validate_and_fix_params(params: SearchParams, conversation_text: str) -> Sea
     if params.min_price and params.min_price < 0:
         params.min_price = 20
         
-    print(f"DEBUG - Final validated parameters: location='{params.location}', guests={params.guests}, price=${params.min_price}-${params.max_price}")
+    logger.debug("Final validated parameters: location='%s', guests=%s, price=$%s-$%s", params.location, params.guests, params.min_price, params.max_price)
     return params
 
 def should_trigger_search(message: str, params: SearchParams, conversation_history: list) -> bool:
@@ -100,38 +138,27 @@ def should_trigger_search(message: str, params: SearchParams, conversation_histo
     
     # Must have location as absolute minimum
     if not params.location:
-        print("DEBUG - No search: Missing location")
+        logger.debug("No search: Missing location")
         return False
     
     message_lower = message.lower().strip()
     
     # 1. Simple affirmative responses to confirmations - ALWAYS search
-    simple_affirmative = [
-        "yes", "yep", "yeah", "ok", "okay", "sure", "go", "go ahead", 
-        "do it", "correct", "that's right", "search", "find", "start",
-        "perfect", "exactly", "sounds good", "looks good", "confirmed"
-    ]
-    
-    if message_lower in simple_affirmative:
-        print(f"DEBUG - IMMEDIATE SEARCH: Affirmative response '{message_lower}'")
+    if message_lower in _AFFIRMATIVE_RESPONSES:
+        logger.debug("IMMEDIATE SEARCH: Affirmative response '%s'", message_lower)
         return True
     
     # 2. Explicit search commands with "now", "please", etc. - search immediately
-    urgent_search_triggers = [
-        "search now", "find now", "go ahead and search", "search please",
-        "just search", "start search", "run search", "do search"
-    ]
-    
-    if any(trigger in message_lower for trigger in urgent_search_triggers):
-        print(f"DEBUG - IMMEDIATE SEARCH: Urgent search command detected")
+    if _URGENT_SEARCH_RE.search(message_lower):
+        logger.debug("IMMEDIATE SEARCH: Urgent search command detected")
         return True
     
     # 3. If message ends with explicit search triggers like "go", "search" - search immediately
     message_words = message_lower.split()
     last_word = message_words[-1] if message_words else ""
     
-    if last_word in ["go", "search", "find", "now", "please"]:
-        print(f"DEBUG - IMMEDIATE SEARCH: Message ends with search trigger '{last_word}'")
+    if last_word in _TRIGGER_LAST_WORDS:
+        logger.debug("IMMEDIATE SEARCH: Message ends with search trigger '%s'", last_word)
         return True
     
     # 4. If this is a follow-up message after we already have good info - auto-search more often
@@ -144,7 +171,7 @@ def should_trigger_search(message: str, params: SearchParams, conversation_histo
     
     # REDUCED the strictness - only require confirmation for VERY complex messages
     if has_comprehensive_info and len(message.split()) > 10:  # Changed from 5 to 10 words
-        print(f"DEBUG - COMPREHENSIVE INFO: Need confirmation for very detailed request")
+        logger.debug("COMPREHENSIVE INFO: Need confirmation for very detailed request")
         return False  # Require confirmation for very comprehensive requests
     
     # 5. Auto-search for most cases when we have location + any detail
@@ -159,21 +186,16 @@ def should_trigger_search(message: str, params: SearchParams, conversation_histo
         )
         
         if has_any_detail:
-            print(f"DEBUG - AUTO SEARCH: Have location + details")
+            logger.debug("AUTO SEARCH: Have location + details")
             return True
     
     # 6. Auto-search for simple additions to existing info
     if params.location:
-        simple_additions = [
-            "center", "downtown", "cheap", "expensive", "budget", "close",
-            "near", "apartment", "house", "studio"
-        ]
-        
-        if any(addition in message_lower for addition in simple_additions):
-            print(f"DEBUG - AUTO SEARCH: Simple addition to existing info")
+        if _SIMPLE_ADDITION_RE.search(message_lower):
+            logger.debug("AUTO SEARCH: Simple addition to existing info")
             return True
     
-    print(f"DEBUG - No search triggered - will show confirmation")
+    logger.debug("No search triggered - will show confirmation")
     return False
 
 def should_show_confirmation(params: SearchParams, conversation_history: list) -> bool:
@@ -192,13 +214,8 @@ def should_show_confirmation(params: SearchParams, conversation_history: list) -
             if msg.get("sender") == "assistant":
                 recent_conversation += msg.get("text", "").lower()
     
-    confirmation_indicators = [
-        "ready?", "correct?", "sound good?", "i'll search", "should i search",
-        "would you like me to search", "confirm", "confirmation"
-    ]
-    
-    if any(indicator in recent_conversation for indicator in confirmation_indicators):
-        print("DEBUG - No confirmation: Already asked recently")
+    if _CONFIRMATION_INDICATOR_RE.search(recent_conversation):
+        logger.debug("No confirmation: Already asked recently")
         return False
     
     # Only show confirmation in very rare cases - when user provided ONLY location
@@ -213,10 +230,10 @@ def should_show_confirmation(params: SearchParams, conversation_history: list) -
     )
     
     if only_has_location:
-        print("DEBUG - Show confirmation: Only location provided, need more details")
+        logger.debug("Show confirmation: Only location provided, need more details")
         return True
     
-    print("DEBUG - No confirmation needed - auto-search")
+    logger.debug("No confirmation needed - auto-search")
     return False
 
 def get_missing_params_message(params: SearchParams) -> str: